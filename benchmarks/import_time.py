@@ -0,0 +1,36 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def time_import(module, runs):
+    """Return the wall time of a fresh interpreter importing module, once per run."""
+    command = [sys.executable, "-c", f"import {module}"]
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time importing game modules in a fresh interpreter.")
+    parser.add_argument("modules", nargs="*", default=["game.manager", "game.articles"])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    baseline = statistics.median(time_import("sys", args.runs))
+    print(f"{'Module':<20}{'Median':>10}{'Min':>10}  (interpreter startup {baseline * 1000:.0f} ms subtracted)")
+    for module in args.modules:
+        times = time_import(module, args.runs)
+        print(f"{module:<20}{(statistics.median(times) - baseline) * 1000:>8.0f}ms{(min(times) - baseline) * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
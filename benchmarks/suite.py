@@ -0,0 +1,265 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from game.league import League  # noqa: E402
+from game.manager import GameManager  # noqa: E402
+from game.match import Match, ENGINES  # noqa: E402
+from game.player import Player  # noqa: E402
+from game.rng import RandomStream  # noqa: E402
+from game.season import Season  # noqa: E402
+from game.stats import get_stats_sink, set_stats_sink  # noqa: E402
+from game.tournament import DoubleEliminationTournament  # noqa: E402
+from game.utils import set_results_output  # noqa: E402
+from game.world_championship import WorldChampionship  # noqa: E402
+
+YEAR = 2024
+PERCENTILES = (50, 90, 99)
+
+
+# Each case takes a seeded stream and returns the function to time. Anything
+# the function needs is built here, so only the measured work is timed.
+
+def _league(rng):
+    return League("Europe", YEAR, rng.spawn())
+
+
+def _played_season(rng):
+    season = Season(_league(rng).teams, YEAR, rng.spawn())
+    season.run_regular_season()
+    return season
+
+
+def _qualified_teams(rng):
+    teams = []
+    for region in ("Americas", "Europe", "China", "Pacific"):
+        league = League(region, YEAR, rng.spawn())
+        teams.extend(sorted(league.teams, key=lambda t: t.rating, reverse=True)[:4])
+    return teams
+
+
+def case_match_bo3(rng):
+    home, away = _league(rng).teams[:2]
+    return lambda: Match(home, away, best_of=3, current_year=YEAR, rng=rng.spawn()).play()
+
+
+def case_match_bo5(rng):
+    home, away = _league(rng).teams[:2]
+    return lambda: Match(home, away, best_of=5, current_year=YEAR, rng=rng.spawn()).play()
+
+
+def case_simulate_round(rng):
+    home, away = _league(rng).teams[:2]
+    match = Match(home, away, current_year=YEAR, rng=rng.spawn())
+    match._get_encounter_probs()  # Built by play() for the round engine
+    return lambda: match.simulate_round(Player.MAPS[0])
+
+
+def case_regular_season(rng):
+    teams = _league(rng).teams
+    return lambda: Season(teams, YEAR, rng.spawn()).run_regular_season()
+
+
+def case_playoffs(rng):
+    top_teams = _played_season(rng).get_top_teams(8)
+    return lambda: DoubleEliminationTournament(top_teams, current_year=YEAR, rng=rng.spawn()).run(silent=True)
+
+
+def case_world_championship(rng):
+    teams = _qualified_teams(rng)
+    return lambda: WorldChampionship(teams, current_year=YEAR, rng=rng.spawn()).run(silent=True)
+
+
+def case_render_standings(rng):
+    season = _played_season(rng)
+    return season.get_standings_text
+
+
+def case_render_results(rng):
+    tournament = DoubleEliminationTournament(_played_season(rng).get_top_teams(8), current_year=YEAR, rng=rng.spawn())
+    tournament.run(silent=True)
+    return tournament.get_results_text
+
+
+def case_full_year(rng):
+    def run_year():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            manager = GameManager(seed=rng.spawn().seed_sequence, generate_summaries=False)
+            manager.simulate_initial_off_season()
+            for _ in range(len(manager.phases) - 1):
+                manager.advance_phase()
+            manager.close()
+    return run_year
+
+
+CASES = {
+    'match_bo3': case_match_bo3,
+    'match_bo5': case_match_bo5,
+    'simulate_round': case_simulate_round,
+    'regular_season': case_regular_season,
+    'playoffs': case_playoffs,
+    'world_championship': case_world_championship,
+    'render_standings': case_render_standings,
+    'render_results': case_render_results,
+    'full_year': case_full_year
+}
+
+
+def run_case(name, seed, min_time, min_runs):
+    """Time one case and return ops/sec, latency percentiles in ms and peak memory."""
+    rng = RandomStream(np.random.SeedSequence(seed, spawn_key=(list(CASES).index(name),)))
+    func = CASES[name](rng)
+    func()  # Warm up caches
+
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - start < min_time:
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+
+    # Measured separately, since tracing slows the calls down
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'runs': len(latencies),
+        'ops_per_sec': len(latencies) / sum(latencies),
+        **{f'p{p}_ms': float(np.percentile(latencies_ms, p)) for p in PERCENTILES},
+        'peak_memory_kb': peak / 1024
+    }
+
+
+def run_suite(names, seed=0, min_time=1.0, min_runs=5, engine=None):
+    if engine:
+        Match.set_default_engine(engine)
+    results = {}
+    for name in names:
+        results[name] = run_case(name, seed, min_time, min_runs)
+        print(format_row(name, results[name]), flush=True)
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'engine': Match.default_engine,
+            'seed': seed
+        },
+        'cases': results
+    }
+
+
+def format_header():
+    return f"{'Case':<20}{'ops/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'peak KB':>10}"
+
+
+def format_row(name, result):
+    return (f"{name:<20}{result['ops_per_sec']:>10.1f}{result['p50_ms']:>10.3f}"
+            f"{result['p90_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['peak_memory_kb']:>10.0f}")
+
+
+def setting_mismatches(baseline, engine, seed):
+    """Return the settings that differ from the baseline's, as 'name: baseline -> current' strings."""
+    meta = baseline.get('meta', {})
+    mismatches = []
+    for name, value in (('engine', engine), ('seed', seed)):
+        if name in meta and meta[name] != value:
+            mismatches.append(f"{name}: {meta[name]} -> {value}")
+    return mismatches
+
+
+def compare(current, baseline, threshold):
+    """Print each case's change against the baseline and return the names that slowed down by more than threshold."""
+    print(f"\n{'Case':<20}{'baseline ops/s':>16}{'ops/s':>10}{'change':>10}")
+    regressions = []
+    for name, result in current['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        before = baseline['cases'][name]['ops_per_sec']
+        change = result['ops_per_sec'] / before - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<20}{before:>16.1f}{result['ops_per_sec']:>10.1f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seeded benchmarks for the simulation hot paths.")
+    parser.add_argument("cases", nargs="*", metavar="CASE",
+                        help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=ENGINES, default=None, help="match simulation engine")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to spend timing each case")
+    parser.add_argument("--min-runs", type=int, default=5, help="minimum timed calls per case")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown in ops/sec counted as a regression (default 0.10)")
+    parser.add_argument("--with-output", action="store_true",
+                        help="write results and match statistics files (to a temporary directory)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    names = args.cases or list(CASES)
+    save_path = os.path.abspath(args.save) if args.save else None
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    baseline = None
+    if compare_path:
+        with open(compare_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Timings from another engine or seed aren't comparable
+        mismatches = setting_mismatches(baseline, args.engine or Match.default_engine, args.seed)
+        if mismatches:
+            print(f"Can't compare against {compare_path}, it was run with different settings "
+                  f"({'; '.join(mismatches)})", file=sys.stderr)
+            return 2
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        if args.with_output:
+            os.chdir(output_dir)
+        else:
+            # Measure the simulation, not the disk
+            set_results_output(False)
+            set_stats_sink('null')
+        print(format_header())
+        current = run_suite(names, args.seed, args.min_time, args.min_runs, args.engine)
+        get_stats_sink().close()  # Finish writing before the directory goes away
+        os.chdir(ROOT)
+
+    if save_path:
+        with open(save_path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nSaved baseline to {save_path}")
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+import os
+import json
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .digest import DEFAULT_MAX_CHARS, build_digest
+from . import metrics
+
+DEFAULT_MODEL = 'gemini-1.5-flash-002'
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "top_k": 10,
+    "max_output_tokens": 8192
+}
+DEFAULT_CONCURRENCY = 4
+# Outside previous_results, which is cleared at the start of every run
+DEFAULT_CACHE_DIR = ".article_cache"
+_END_OF_ARTICLE = object()
+
+
+class ArticleBackend:
+    """Turns a prompt into article text. Subclasses must be safe to call from several threads."""
+
+    def generate(self, prompt):
+        raise NotImplementedError
+
+    def generate_stream(self, prompt):
+        """Yield the article in chunks as they are produced; by default all at once."""
+        yield self.generate(prompt)
+
+    def describe(self):
+        """Return the model and settings, which decide what the backend writes for a prompt."""
+        return {'backend': type(self).__name__}
+
+
+class GeminiBackend(ArticleBackend):
+    """Writes articles with Google's Gemini API, using GOOGLE_API_KEY from the environment or .env."""
+
+    def __init__(self, model_name=DEFAULT_MODEL, generation_config=None):
+        # Imported here so the stub backend works without the Gemini client
+        import dotenv
+        import google.generativeai as genai
+        from google.generativeai.types import RequestOptions
+        from google.api_core import retry
+
+        dotenv.load_dotenv()
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        self.model_name = model_name
+        self.generation_config = generation_config or DEFAULT_GENERATION_CONFIG
+        self.model = genai.GenerativeModel(model_name)
+        self.request_options = RequestOptions(
+            retry=retry.Retry(
+                initial=10,
+                multiplier=2,
+                maximum=60,
+                timeout=300
+            )
+        )
+
+    def generate(self, prompt):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self.generation_config,
+            request_options=self.request_options
+        )
+        return response.text
+
+    def generate_stream(self, prompt):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self.generation_config,
+            request_options=self.request_options,
+            stream=True
+        )
+        for chunk in response:
+            yield chunk.text
+
+    def describe(self):
+        return {'backend': 'gemini', 'model': self.model_name, 'generation_config': self.generation_config}
+
+
+class StubBackend(ArticleBackend):
+    """Offline stand-in that returns a placeholder article, optionally after a simulated delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def generate(self, prompt):
+        if self.delay:
+            time.sleep(self.delay)
+        return self._article(prompt)
+
+    def generate_stream(self, prompt):
+        # The delay stands in for the time to the first chunk
+        if self.delay:
+            time.sleep(self.delay)
+        article = self._article(prompt)
+        for i in range(0, len(article), 16):
+            yield article[i:i + 16]
+
+    def _article(self, prompt):
+        return f"# Stub Article\n\nGenerated offline from a {len(prompt)} character prompt."
+
+    def describe(self):
+        return {'backend': 'stub'}
+
+
+class RateLimiter:
+    """Spaces out calls so no more than requests_per_minute start in any minute."""
+
+    def __init__(self, requests_per_minute=None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ArticleCache:
+    """Generated articles on disk, keyed by a hash of everything that went into them."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    @staticmethod
+    def key(prompt, filtered_results, previous_summary, backend_config):
+        content = json.dumps([prompt, filtered_results, previous_summary, backend_config], sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.md")
+
+    def get(self, key):
+        """Return the cached article, or None."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, text):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so an interrupted run never leaves half an article
+        temp_path = self._path(key) + f".{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, self._path(key))
+
+
+def get_relevant_results(results_data, section_name):
+    """Extract relevant portions of results data based on the article section"""
+    relevant_data = {}
+    
+    for filename, content in results_data.items():
+        sections = content.split("\n\n\n")  # Split by triple newline to separate major sections
+        
+        if section_name in ["preseason_preview", "player_spotlight"]:
+            # Only include Off-Season and Preseason sections
+            relevant_sections = [section for section in sections 
+                               if "Off-Season Results" in section 
+                               or "Preseason Preview" in section]
+            
+        elif section_name in ["regular_season_recap", "playoff_preview"]:
+            # Include everything up through Regular Season
+            relevant_sections = [section for section in sections 
+                               if "Off-Season Results" in section 
+                               or "Preseason Preview" in section
+                               or "Regular Season Results" in section]
+            
+        elif section_name in ["playoff_drama", "playoff_analysis"]:
+            # Include everything up through Playoffs
+            relevant_sections = [section for section in sections 
+                               if "Off-Season Results" in section 
+                               or "Preseason Preview" in section
+                               or "Regular Season Results" in section
+                               or "Playoff Results" in section]
+            
+        else:  # worlds_preview and worlds_recap
+            # Include all sections
+            relevant_sections = sections
+            
+        if relevant_sections:
+            relevant_data[filename] = "\n\n\n".join(relevant_sections)
+    
+    return relevant_data
+
+def build_section_prompts(year):
+    """Return the prompt for each article, in the order they appear in the summary"""
+    # Add journalist persona
+    journalist_persona = """You are Dave Carrington, a veteran journalist assigned to cover the Valorant Champions Tour. You are known for:
+    - Your professional writing style
+    - Analyzing the results and offseason events to provide context for the upcoming season
+    - Thoroughly explaining your thought process when providing opinions and predictions
+    Write in your authentic voice while maintaining journalistic integrity."""
+
+    section_prompts = {
+        "preseason_preview": f"""{journalist_persona}
+            Write a complete news article about preseason expectations for {year}.
+            Include 2-3 attention-grabbing headlines and focus on team/player predictions.
+            Format as a standalone news article with a title, date ({year}-01-15), and journalist byline.""",
+            
+        "player_spotlight": f"""{journalist_persona}
+            Write a complete news article analyzing the top players heading into {year}.
+            Focus on their previous achievements and expectations.
+            Format as a standalone news article with a title, date ({year}-02-01), and journalist byline.""",
+            
+        "regular_season_recap": f"""{journalist_persona}
+            Write a complete news article covering the key storylines from the {year} regular season.
+            Include regional highlights and standout performances.
+            Format as a standalone news article with a title, date ({year}-06-15), and journalist byline.""",
+            
+        "playoff_preview": f"""{journalist_persona}
+            Write a complete news article previewing the {year} playoffs.
+            Include predictions and key matchups to watch.
+            Format as a standalone news article with a title, date ({year}-08-01), and journalist byline.""",
+            
+        "playoff_analysis": f"""{journalist_persona}
+            Write a complete news article analyzing the {year} playoff results.
+            Compare the actual results to pre-playoff predictions, highlight dramatic moments and upsets,
+            and provide detailed breakdowns of winning strategies and team performances.
+            Format as a standalone news article with a title, date ({year}-08-20), and journalist byline.""",
+            
+        "worlds_preview": f"""{journalist_persona}
+            Write a complete news article previewing the {year} World Championship.
+            Include predictions and teams to watch.
+            Format as a standalone news article with a title, date ({year}-10-10), and journalist byline.""",
+            
+        "worlds_recap": f"""{journalist_persona}
+            Write a complete news article covering the {year} World Championship results.
+            Include detailed tournament analysis and historical context.
+            Format as a standalone news article with a title, date ({year}-11-15), and journalist byline."""
+    }
+
+    return section_prompts
+
+def generate_yearly_summary(year, backend=None, concurrency=DEFAULT_CONCURRENCY, requests_per_minute=None,
+                            cache=DEFAULT_CACHE_DIR, source=None, digest_chars=DEFAULT_MAX_CHARS,
+                            stream=False, timings=None):
+    """Generate a collection of AI-written articles summarizing different aspects of the year
+
+    Up to `concurrency` articles are written at once, starting at most
+    `requests_per_minute` requests per minute if given. The backend defaults
+    to Gemini; pass StubBackend() to run offline. Each article is cached in
+    the `cache` directory (None to disable), so a rerun only writes the
+    articles whose prompt, results, previous summary or model changed.
+
+    Given the GameManager as `source`, each prompt gets a compact JSON
+    digest of the year (see game/digest.py) of at most `digest_chars`
+    characters instead of the raw results files.
+
+    With `stream`, articles are written to yearly_summary.md and printed as
+    the model produces them, in order. If `timings` is a dict, it is filled
+    with each article's seconds to first chunk and in total.
+    """
+    year_dir = os.path.join("previous_results", str(year))
+    if not os.path.exists(year_dir):
+        return None
+    
+    # Read all result files
+    results_data = {}
+    for filename in os.listdir(year_dir):
+        if filename.endswith("_results.txt"):
+            with open(os.path.join(year_dir, filename), 'r', encoding='utf-8') as f:
+                results_data[filename] = f.read()
+    
+    # Get previous year's summary
+    previous_year = year - 1
+    previous_summary = ""
+    previous_year_dir = os.path.join("previous_results", str(previous_year))
+    previous_summary_path = os.path.join(previous_year_dir, "yearly_summary.md")
+    if os.path.exists(previous_summary_path):
+        with open(previous_summary_path, 'r', encoding='utf-8') as f:
+            previous_summary = f.read()
+
+    backend = backend or GeminiBackend()
+    backend_config = backend.describe()
+    article_cache = ArticleCache(cache) if cache else None
+    limiter = RateLimiter(requests_per_minute)
+    metrics_lock = threading.Lock()  # Articles finish on several threads
+    context = f"\nHere's some context for the current season and previous year. Use it to create storylines for the upcoming season when relevant: {previous_summary}" if previous_summary else ""
+
+    def write_article(section_name, prompt, chunks=None):
+        """Return the article, passing its text to the chunks queue as it arrives.
+
+        Errors are raised through the future and reported by the caller, so
+        nothing is printed from the pool's threads in the middle of a
+        streamed article.
+        """
+        start = time.perf_counter()
+        first_chunk = None
+        cached = False
+        try:
+            if source is not None:
+                filtered_results = build_digest(source, section_name, digest_chars)
+            else:
+                # Get relevant portions of results data for this section
+                filtered_results = get_relevant_results(results_data, section_name)
+            key = ArticleCache.key(prompt, filtered_results, previous_summary, backend_config) if article_cache else None
+            article = article_cache.get(key) if article_cache else None
+
+            if article is not None:
+                cached = True
+                parts = [article]
+            else:
+                limiter.wait()
+                start = time.perf_counter()  # Time the model, not the rate limit
+                full_prompt = prompt + context + f"\n\nResults data:\n{json.dumps(filtered_results)}"
+                parts = backend.generate_stream(full_prompt) if chunks else [backend.generate(full_prompt)]
+
+            text = []
+            for part in parts:
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                text.append(part)
+                if chunks:
+                    chunks.put(part)
+
+            if article is None:
+                article = ''.join(text)
+                if article_cache:
+                    article_cache.put(key, article)
+            return article
+        finally:
+            total = time.perf_counter() - start
+            if timings is not None:
+                timings[section_name] = {'first_chunk': first_chunk, 'total': total}
+            if metrics.metrics_enabled():
+                with metrics_lock:
+                    if cached:
+                        metrics.count('llm_cache_hits')
+                    else:
+                        metrics.add_time(f"llm/{section_name}", total)
+                        if first_chunk is not None:
+                            metrics.add_time(f"llm/{section_name}/first_chunk", first_chunk)
+            if chunks:
+                chunks.put(_END_OF_ARTICLE)
+
+    section_prompts = build_section_prompts(year)
+    summary_path = os.path.join(year_dir, "yearly_summary.md")
+    summary = f"# {year} Season Coverage\n\n"
+    summary += "---\n\n"
+
+    if stream:
+        # Every article is generated at once into its own queue; they are
+        # written out in order, so later ones buffer until their turn
+        queues = {name: queue.Queue() for name in section_prompts}
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor, \
+                open(summary_path, 'w', encoding='utf-8') as f:
+            futures = {
+                name: executor.submit(write_article, name, prompt, queues[name])
+                for name, prompt in section_prompts.items()
+            }
+
+            def emit(text):
+                f.write(text)
+                f.flush()  # Finished sections survive a crash
+                print(text, end='', flush=True)
+
+            emit(summary)
+            for section_name in section_prompts:
+                text = []
+                while (chunk := queues[section_name].get()) is not _END_OF_ARTICLE:
+                    emit(chunk)
+                    text.append(chunk)
+                error = futures[section_name].exception()
+                if error is not None:
+                    ending = f"\n\n[Error generating {section_name} article]\n\n---\n\n" if text else \
+                        f"[Error generating {section_name} article]\n\n---\n\n"
+                else:
+                    ending = "\n\n---\n\n"
+                emit(ending)
+                summary += ''.join(text) + ending
+                if error is not None:
+                    # Reported between articles, after the section's marker
+                    print(f"Error generating {section_name} article: {error}")
+        return summary
+
+    # Generate every article at once, then assemble them in order
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {name: executor.submit(write_article, name, prompt) for name, prompt in section_prompts.items()}
+        articles = {}
+        for name, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                print(f"Error generating {name} article: {error}")
+            articles[name] = None if error is not None else future.result()
+
+    for section_name in section_prompts:
+        if articles[section_name] is None:
+            summary += f"[Error generating {section_name} article]\n\n---\n\n"
+        else:
+            # Write article with separator
+            summary += f"{articles[section_name]}\n\n"
+            summary += "---\n\n"
+
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write(summary)
+    return summary
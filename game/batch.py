@@ -0,0 +1,104 @@
+import argparse
+import contextlib
+import os
+import time
+
+from .manager import GameManager
+from .match import Match, ENGINES
+from .memory import DEFAULT_MEMORY_REPORT, MemoryTracker
+from .metrics import enable_metrics
+from .profiling import add_profile_arguments, profiler_from_args
+from .results_db import DEFAULT_DB_PATH
+from .stats import STATS_SINKS, set_stats_sink
+from .utils import clear_previous_results, set_results_output
+
+
+def run_batch(years, seed=None, write_results=True, verbose=False, report_every=10, workers=None, results_db=None,
+              profiler=None, memory=None):
+    """Simulate whole years, Off-Season through World Championship, without prompts.
+
+    Returns the GameManager and the number of seasons simulated per second.
+    """
+    set_results_output(write_results)
+    if write_results:
+        clear_previous_results()
+
+    manager = GameManager(seed=seed, generate_summaries=False, workers=workers, results_db=results_db,
+                          profiler=profiler, memory=memory)
+    start = time.perf_counter()
+
+    with open(os.devnull, 'w') as devnull:
+        console = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull)
+        with console:
+            manager.simulate_initial_off_season()
+
+        for year_index in range(1, years + 1):
+            with console:
+                # Preseason through World Championship
+                for _ in range(len(manager.phases) - 1):
+                    manager.advance_phase()
+                champion = manager.world_championship.final_standings[0]
+                year = manager.current_year
+                # Season end and the next year's Off-Season
+                if year_index < years:
+                    manager.advance_phase()
+
+            if report_every and (year_index % report_every == 0 or year_index == years):
+                elapsed = time.perf_counter() - start
+                print(f"Year {year} ({year_index}/{years}) champion: {champion.name} - "
+                      f"{year_index / elapsed:.2f} seasons/s")
+
+    manager.close()
+    elapsed = time.perf_counter() - start
+    return manager, years / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.batch",
+        description="Simulate many years headlessly, with no console prompts."
+    )
+    parser.add_argument("--years", type=int, default=1, help="number of years to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="master seed for a reproducible run")
+    parser.add_argument("--engine", choices=ENGINES, default=Match.default_engine, help="match simulation engine")
+    parser.add_argument("--compact", action="store_true", help="keep compact match history (see Match.compact_history)")
+    parser.add_argument("--no-results", action="store_true", help="don't write result or match statistics files")
+    parser.add_argument("--stats", choices=STATS_SINKS, default='text', help="match statistics format ('null' discards them)")
+    parser.add_argument("--db", nargs="?", const=DEFAULT_DB_PATH, default=None, metavar="PATH",
+                        help=f"also store results in SQLite (default path: {DEFAULT_DB_PATH})")
+    parser.add_argument("--report-every", type=int, default=10, help="print progress every N years (0 to disable)")
+    parser.add_argument("--workers", type=int, default=None, help="run league phases in N worker processes")
+    parser.add_argument("--verbose", action="store_true", help="show the simulation's console output")
+    parser.add_argument("--metrics", action="store_true",
+                        help="write timings and counters to previous_results/<year>/metrics.json")
+    add_profile_arguments(parser)
+    parser.add_argument("--memory", nargs="?", const=DEFAULT_MEMORY_REPORT, default=None, metavar="PATH",
+                        help=f"snapshot memory after every phase into a JSON lines report (default: {DEFAULT_MEMORY_REPORT})")
+    args = parser.parse_args(argv)
+
+    Match.set_default_engine(args.engine)
+    Match.compact_history = args.compact
+    set_stats_sink(args.stats)
+    enable_metrics(args.metrics)
+    memory = MemoryTracker(args.memory) if args.memory else None
+
+    _, seasons_per_second = run_batch(
+        args.years,
+        seed=args.seed,
+        write_results=not args.no_results,
+        verbose=args.verbose,
+        report_every=args.report_every,
+        workers=args.workers,
+        results_db=args.db,
+        profiler=profiler_from_args(args),
+        memory=memory
+    )
+    elapsed = args.years / seasons_per_second
+    print(f"Simulated {args.years} years in {elapsed:.2f}s ({seasons_per_second:.2f} seasons/s, engine: {args.engine})")
+    if memory is not None:
+        print(f"\nMemory after each World Championship (every phase in {args.memory}):")
+        print(memory.format_summary("World Championship"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import json
+
+DEFAULT_MAX_CHARS = 8000
+# (list limit, table limit) pairs tried in turn until the digest fits. Lists
+# (roster changes, top players, upsets, top performers) are cut first, then
+# tables (ratings, standings, playoff and Worlds placings, bracket paths);
+# None leaves the tables whole. The last step empties every section, which
+# is the smallest a digest gets: under 1000 characters with four leagues.
+DIGEST_LIMITS = ((10, None), (5, None), (3, None), (1, None), (1, 4), (1, 2), (1, 1), (0, 0))
+
+# How far into the year each article may look, matching get_relevant_results
+SECTION_STAGES = {
+    "preseason_preview": "preseason",
+    "player_spotlight": "preseason",
+    "regular_season_recap": "regular_season",
+    "playoff_preview": "regular_season",
+    "playoff_drama": "playoffs",
+    "playoff_analysis": "playoffs",
+    "worlds_preview": "worlds",
+    "worlds_recap": "worlds"
+}
+STAGES = ("preseason", "regular_season", "playoffs", "worlds")
+
+
+def build_digest(manager, section_name, max_chars=DEFAULT_MAX_CHARS):
+    """Return a compact summary of the year for one article, built from the simulation objects.
+
+    Covers roster changes, preseason ratings, standings, upsets by rating
+    gap, top players by K/D/A and each contender's bracket path, up to the
+    point of the year the article is about. Lists and then tables are
+    shortened until the JSON is at most max_chars long, or as short as they
+    go (see DIGEST_LIMITS).
+    """
+    stage = STAGES.index(SECTION_STAGES.get(section_name, "worlds"))
+    for limit, table_limit in DIGEST_LIMITS:
+        digest = _build(manager, stage, limit, table_limit)
+        if len(json.dumps(digest)) <= max_chars:
+            break
+    return digest
+
+
+def _cut(rows, limit):
+    return rows if limit is None else rows[:limit]
+
+
+def _build(manager, stage, limit, table_limit=None):
+    # At most the top four teams get bracket paths
+    path_limit = 4 if table_limit is None else min(4, table_limit)
+    digest = {'year': manager.current_year, 'leagues': {}}
+    for league in manager.leagues:
+        league_digest = {
+            'roster_changes': [
+                f"{team_name}: {change}"
+                for team_name, changes in (league.off_season_results or [])
+                for change in changes if "left" in change
+            ][:limit],
+            'top_players': [
+                [player.gamer_tag, team.name, round(float(player.skill), 1)]
+                for player, team in league.get_top_players(limit)
+            ]
+        }
+
+        season = league.season
+        if stage == 0 or season is None or season.current_year != manager.current_year:
+            # Standings replace the preseason ratings once the season is played
+            league_digest['team_ratings'] = [
+                [team.name, round(float(team.rating), 1)]
+                for team in _cut(sorted(league.teams, key=lambda t: t.rating, reverse=True), table_limit)
+            ]
+        elif stage >= 1:
+            results = [match.play() for match in season.matches]
+            league_digest['standings'] = [list(row) for row in _cut(season.get_snapshot(), table_limit)]
+            league_digest['upsets'] = _upsets(results, limit)
+            league_digest['top_performers'] = _top_performers(results, limit)
+
+        tournament = league.playoff_tournament
+        if stage >= 2 and tournament is not None and tournament.current_year == manager.current_year:
+            league_digest['playoff_standings'] = [team.name for team in _cut(league.playoff_results, table_limit)]
+            league_digest['playoff_paths'] = _bracket_paths(tournament.match_results,
+                                                            league.playoff_results[:path_limit])
+            league_digest['playoff_upsets'] = _upsets([result for _, result in tournament.match_results], limit)
+
+        digest['leagues'][league.name] = league_digest
+
+    world_championship = manager.world_championship
+    if stage >= 3 and world_championship is not None and world_championship.current_year == manager.current_year:
+        digest['worlds'] = {
+            'final_standings': [team.name for team in _cut(world_championship.final_standings, table_limit)],
+            'paths': _bracket_paths(world_championship.match_results,
+                                    world_championship.final_standings[:path_limit]),
+            'upsets': _upsets([result for _, result in world_championship.match_results], limit)
+        }
+    return digest
+
+
+def _score(result, team):
+    if result['home_team'] is team:
+        return f"{result['home_score']}-{result['away_score']}"
+    return f"{result['away_score']}-{result['home_score']}"
+
+
+def _upsets(results, limit):
+    """Return the wins with the largest rating gap in the loser's favour."""
+    upsets = [
+        (float(result['loser'].rating - result['winner'].rating), result)
+        for result in results if result['loser'].rating > result['winner'].rating
+    ]
+    upsets.sort(key=lambda x: x[0], reverse=True)
+    return [
+        {'winner': result['winner'].name, 'loser': result['loser'].name,
+         'score': _score(result, result['winner']), 'rating_gap': round(gap, 1)}
+        for gap, result in upsets[:limit]
+    ]
+
+
+def _top_performers(results, limit):
+    """Return the players with the most kills, with their K/D/A totals."""
+    totals = {}  # Player ID -> [gamer tag, team name, K, D, A]
+    for result in results:
+        for game in result['games']:
+            if game['stats'] is None:
+                continue  # The markov engine doesn't produce player statistics
+            for team_key, team_stats in game['stats'].items():
+                for player_id, stats in team_stats.items():
+                    total = totals.get(player_id)
+                    if total is None:
+                        gamer_tag = result['lineups'][team_key][player_id][2]
+                        total = totals[player_id] = [gamer_tag, result[team_key].name, 0, 0, 0]
+                    total[2] += stats['K']
+                    total[3] += stats['D']
+                    total[4] += stats['A']
+    return sorted(totals.values(), key=lambda x: x[2], reverse=True)[:limit]
+
+
+def _bracket_paths(match_results, teams):
+    """Return each team's matches in order, as [stage, opponent, score] rows."""
+    paths = {}
+    for team in teams:
+        paths[team.name] = [
+            [stage, (result['away_team'] if result['home_team'] is team else result['home_team']).name,
+             _score(result, team)]
+            for stage, result in match_results
+            if team is result['home_team'] or team is result['away_team']
+        ]
+    return paths
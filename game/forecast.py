@@ -0,0 +1,137 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .league import League
+from .metrics import paused_metrics
+from .parallel import simulation_settings
+from .rng import RandomStream
+from .season import Season
+from .tournament import DoubleEliminationTournament
+from .world_championship import WorldChampionship
+
+OUTCOMES = ('playoffs', 'worlds', 'champion')
+CHUNKS_PER_WORKER = 4
+
+
+class Forecaster:
+    """Monte Carlo forecast of the rest of the year.
+
+    Takes a GameManager or a single League and simulates whatever is left of
+    the year (regular season, playoffs and, for a GameManager, the World
+    Championship) many times from the current state. Reports each team's
+    chance of making the playoffs, qualifying for Worlds and winning it all.
+    For a single League, winning it all means winning the regional playoffs.
+    """
+
+    def __init__(self, source, simulations=10000, workers=None, seed=None, engine='markov'):
+        self.simulations = simulations
+        self.workers = workers
+        self.engine = engine
+        self.rng = RandomStream(seed)
+        self.state = self._capture_state(source)
+        self.odds = None
+
+    def _capture_state(self, source):
+        """Record what has already been decided this year."""
+        if isinstance(source, League):
+            leagues, include_worlds = [source], False
+        else:
+            leagues, include_worlds = source.leagues, True
+        year = leagues[0].current_year
+
+        league_states = []
+        for league in leagues:
+            # Seasons and playoffs from earlier years are still attached until replaced
+            season_done = league.season is not None and league.season.current_year == year
+            playoffs_done = (league.playoff_tournament is not None
+                             and league.playoff_tournament.current_year == year)
+            league_states.append({
+                'teams': league.teams,
+                'top_teams': league.season.get_top_teams(8) if season_done else None,
+                'qualified': league.playoff_results[:4] if playoffs_done else None
+            })
+        return {'year': year, 'leagues': league_states, 'include_worlds': include_worlds}
+
+    def run(self):
+        """Simulate the remaining year self.simulations times and return each team's odds."""
+        # One seed per universe, so results don't depend on how work is split
+        seeds = self.rng.seed_sequence.spawn(self.simulations)
+        with simulation_settings(engine=self.engine, compact_history=True, results_output=False):
+            if self.workers and self.workers > 1:
+                size = max(1, -(-len(seeds) // (self.workers * CHUNKS_PER_WORKER)))
+                chunks = [seeds[i:i + size] for i in range(0, len(seeds), size)]
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(_simulate_chunk, self.state, chunk, self.engine) for chunk in chunks]
+                    counts = [future.result() for future in futures]
+            else:
+                counts = [_simulate_chunk(self.state, seeds, self.engine)]
+
+        totals = {outcome: Counter() for outcome in OUTCOMES}
+        for chunk_counts in counts:
+            for outcome in OUTCOMES:
+                totals[outcome].update(chunk_counts[outcome])
+
+        self.odds = {
+            team.name: {outcome: totals[outcome][team.name] / self.simulations for outcome in OUTCOMES}
+            for league in self.state['leagues'] for team in league['teams']
+        }
+        return self.odds
+
+    def get_report_text(self):
+        """Return the forecast as a table sorted by chance of winning it all."""
+        odds = self.odds if self.odds is not None else self.run()
+        text = f"Forecast ({self.simulations} simulations)\n"
+        text += "-" * 60 + "\n"
+        text += f"{'Team':<25}{'Playoffs':>10}{'Worlds':>10}{'Champion':>12}\n"
+        for name, team_odds in sorted(odds.items(), key=lambda x: (x[1]['champion'], x[1]['worlds'], x[1]['playoffs']), reverse=True):
+            text += f"{name:<25}{team_odds['playoffs']:>10.1%}{team_odds['worlds']:>10.1%}{team_odds['champion']:>12.1%}\n"
+        return text
+
+
+def _simulate_chunk(state, seeds, engine):
+    """Simulate one universe per seed and count each team's outcomes."""
+    # Forecast universes aren't part of the year, so they stay out of its metrics
+    with simulation_settings(engine=engine, compact_history=True, results_output=False), paused_metrics():
+        counts = {outcome: Counter() for outcome in OUTCOMES}
+        for seed in seeds:
+            for outcome, teams in _simulate_universe(state, RandomStream(seed)).items():
+                counts[outcome].update(team.name for team in teams)
+    return counts
+
+
+def _simulate_universe(state, rng):
+    """Play out the rest of one year and return the teams reaching each outcome."""
+    year = state['year']
+    outcomes = {'playoffs': [], 'worlds': [], 'champion': []}
+    qualified = []
+
+    for league in state['leagues']:
+        top_teams = league['top_teams']
+        if top_teams is None:
+            season = Season(league['teams'], year, rng.spawn())
+            season.run_regular_season()
+            top_teams = season.get_top_teams(8)
+
+        league_qualified = league['qualified']
+        if league_qualified is None:
+            tournament = DoubleEliminationTournament(
+                teams=top_teams,
+                seeded=True,
+                match_type='P',
+                current_year=year,
+                rng=rng.spawn()
+            )
+            tournament.run(silent=True)
+            league_qualified = tournament.get_standings()[:4]
+
+        outcomes['playoffs'].extend(top_teams)
+        outcomes['worlds'].extend(league_qualified)
+        qualified.extend(league_qualified)
+
+    if state['include_worlds']:
+        world_championship = WorldChampionship(teams=qualified, current_year=year, rng=rng.spawn())
+        world_championship.run(silent=True)
+        outcomes['champion'].append(world_championship.final_standings[0])
+    else:
+        outcomes['champion'].append(qualified[0])
+    return outcomes
@@ -1,15 +1,21 @@
+import numpy as np
 from .season import Season
 from .team import Team
+from .player import Player
 from .utils import load_team_names, save_results
 from .tournament import DoubleEliminationTournament
+from .rng import RandomStream
 
 class League:
     team_names = load_team_names()
 
-    def __init__(self, name, current_year):
+    def __init__(self, name, current_year, rng=None):
         self.name = name
         self.current_year = current_year
-        self.teams = [Team(team_name, self.name) for team_name in self.team_names[name]]
+        # Everything in the league draws from this stream, so leagues don't
+        # depend on each other or on the order they are simulated in
+        self.rng = rng or RandomStream()
+        self.teams = [Team(team_name, self.name, self.rng) for team_name in self.team_names[name]]
         self.season = None
         self.playoff_results = None
         self.off_season_results = None
@@ -38,8 +44,8 @@ class League:
         for team in self.teams:
             team.store_previous_rating()
 
-    def generate_preseason_preview(self):
-        """Generate a preview of teams for the upcoming season"""
+    def generate_preseason_preview(self, odds=None):
+        """Generate a preview of teams for the upcoming season, with forecast odds if given"""
         # Sort teams by current skill
         sorted_teams = sorted(self.teams, key=lambda x: x.get_average_skill(), reverse=True)
         
@@ -65,21 +71,25 @@ class League:
         preview += "\nTop Players:\n"
         preview += "-" * 40 + "\n"
         
-        # Get all players from all teams with their team info
-        all_players = [(player, team) for team in self.teams for player in team.players]
-        # Sort by skill
-        top_players = sorted(all_players, key=lambda x: x[0].skill, reverse=True)[:10]
-        
-        for i, (player, team) in enumerate(top_players, 1):
+        for i, (player, team) in enumerate(self.get_top_players(10), 1):
             # Use the player's gamer tag instead of name
             preview += f"{i}. {player.gamer_tag:<20} ({team.name}) - Skill: {player.skill:.1f}\n"
         
+        # Forecast odds (see game/forecast.py)
+        if odds:
+            preview += "\nForecast Odds (Playoffs / Worlds / Champion):\n"
+            preview += "-" * 40 + "\n"
+            ranked = sorted(self.teams, key=lambda t: (odds[t.name]['champion'], odds[t.name]['worlds'], odds[t.name]['playoffs']), reverse=True)
+            for team in ranked:
+                team_odds = odds[team.name]
+                preview += f"{team.name:<20} {team_odds['playoffs']:>6.1%} {team_odds['worlds']:>6.1%} {team_odds['champion']:>6.1%}\n"
+        
         save_results(self.current_year, self.name, preview)
         self.preseason_preview = preview
         return preview
 
     def run_regular_season(self):
-        self.season = Season(self.teams, self.current_year)
+        self.season = Season(self.teams, self.current_year, self.rng.spawn())
         self.season.run_regular_season()
         
         # Format and save regular season results
@@ -96,7 +106,8 @@ class League:
             teams=top_teams,
             seeded=True,
             match_type='P',
-            current_year=self.current_year
+            current_year=self.current_year,
+            rng=self.rng.spawn()
         )
         self.playoff_tournament.run(silent=True)
         self.playoff_results = self.playoff_tournament.get_standings()
@@ -142,6 +153,12 @@ class League:
     def get_playoff_results(self):
         return self.playoff_results
 
+    def get_top_players(self, count):
+        """Return the most skilled players as (player, team) pairs, ties in roster order."""
+        players = {player.id: player for team in self.teams for player in team.players}
+        player_ids = np.concatenate([team.player_ids for team in self.teams])
+        return [(players[i], players[i].team) for i in Player.registry.top_players(player_ids, count).tolist()]
+
     def get_top_teams(self, count):
         if self.season:
             return self.season.get_top_teams(count)
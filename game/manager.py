@@ -1,20 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from .season import Season
 from .league import League
 from .world_championship import WorldChampionship
 from .utils import generate_yearly_summary
+from .rng import RandomStream
+from .parallel import LEAGUE_PHASES, PARALLEL_PHASES, run_league_phase, run_league_phase_parallel
+from .forecast import Forecaster
+from .stats import get_stats_sink
+from .results_db import ResultsStore
+from .metrics import timer, save_metrics
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, seed=None, generate_summaries=None, workers=None, forecast_simulations=0, results_db=None,
+                 profiler=None, memory=None):
         self.current_year = 2024
+        # None asks after each World Championship; True/False skips the prompt
+        self.generate_summaries = generate_summaries
+        # Master stream: each league and World Championship gets its own child,
+        # so the same seed always reproduces the same simulation
+        self.rng = RandomStream(seed)
         self.leagues = [
-            League("Americas", self.current_year),
-            League("Europe", self.current_year),
-            League("China", self.current_year),
-            League("Pacific", self.current_year)
+            League("Americas", self.current_year, self.rng.spawn()),
+            League("Europe", self.current_year, self.rng.spawn()),
+            League("China", self.current_year, self.rng.spawn()),
+            League("Pacific", self.current_year, self.rng.spawn())
         ]
         self.current_phase = "Off-Season"
         self.phases = ["Off-Season", "Preseason", "Regular Season", "Playoffs", "World Championship"]
         self.world_championship = None
+        # Preseason previews include Monte Carlo odds when this is above zero;
+        # forecasts draw from their own stream so they don't change the simulation
+        self.forecast_simulations = forecast_simulations
+        self.forecast_rng = self.rng.spawn()
+        # With more than one worker, league phases run in a process pool
+        self.workers = workers
+        self._executor = None
+        # Optional SQLite copy of the results (see game/results_db.py)
+        self.results_store = ResultsStore(results_db) if results_db else None
+        # Optional PhaseProfiler (see game/profiling.py); profiles are written by close()
+        self.profiler = profiler
+        # Optional MemoryTracker (see game/memory.py), snapshotted after every phase
+        self.memory = memory
 
     def start_game(self):
         while True:
@@ -44,22 +71,64 @@ class GameManager:
 
     def simulate_current_phase(self):
         print(f"Simulating {self.current_phase}...")
-        if self.current_phase == "Off-Season":
-            for league in self.leagues:
-                league.run_off_season()
-        elif self.current_phase == "Preseason":
-            for league in self.leagues:
-                league.preseason_preview = league.generate_preseason_preview()  # Store the generated preview
-        elif self.current_phase == "Regular Season":
-            for league in self.leagues:
-                league.run_regular_season()
-        elif self.current_phase == "Playoffs":
-            for league in self.leagues:
-                league.run_playoffs()
-        elif self.current_phase == "World Championship":
-            self.run_world_championship()
+        with timer(f"phase/{self.current_phase}"), self._profile(self.current_phase):
+            if self.current_phase in LEAGUE_PHASES:
+                self.run_league_phase(self.current_phase)
+            elif self.current_phase == "Preseason":
+                odds = self.forecast() if self.forecast_simulations else None
+                for league in self.leagues:
+                    league.preseason_preview = league.generate_preseason_preview(odds)  # Store the generated preview
+            elif self.current_phase == "World Championship":
+                self.run_world_championship()
+            # Write the phase's match statistics in one batch
+            get_stats_sink().flush()
+            if self.results_store is not None:
+                self.results_store.record_phase(self, self.current_phase)
+        if self.current_phase == self.phases[-1]:
+            # The year is complete; metrics from here on count towards the next one
+            save_metrics(self.current_year)
+        if self.memory is not None:
+            self.memory.snapshot(self.current_year, self.current_phase)
         print(f"{self.current_phase} simulation complete.")
 
+    def _profile(self, phase):
+        return self.profiler.profile(phase) if self.profiler else nullcontext()
+
+    def run_league_phase(self, phase):
+        """Run a phase for every league, in worker processes if enabled and the phase allows it."""
+        if self.workers and self.workers > 1 and phase in PARALLEL_PHASES:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self.leagues = run_league_phase_parallel(self._executor, self.leagues, phase)
+        else:
+            for league in self.leagues:
+                run_league_phase(league, phase)
+
+    def forecast(self):
+        """Return Monte Carlo odds for every team over the rest of the year."""
+        forecaster = Forecaster(
+            self,
+            simulations=self.forecast_simulations,
+            workers=self.workers,
+            seed=self.forecast_rng.spawn().seed_sequence
+        )
+        return forecaster.run()
+
+    def close(self):
+        """Shut down the worker processes, if any were started, and finish writing results and profiles."""
+        get_stats_sink().close()
+        if self.profiler is not None:
+            for path in self.profiler.save():
+                print(f"Wrote profile {path}")
+        if self.memory is not None:
+            self.memory.close()
+        if self.results_store is not None:
+            self.results_store.close()
+            self.results_store = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
     def view_league(self, league):
         if self.current_phase == "Off-Season":
             print(f"\n{league.name} Off-Season Results:")
@@ -106,7 +175,8 @@ class GameManager:
         if len(qualified_teams) == 16:
             self.world_championship = WorldChampionship(
                 teams=qualified_teams,
-                current_year=self.current_year
+                current_year=self.current_year,
+                rng=self.rng.spawn()
             )
             self.world_championship.run()
             
@@ -119,19 +189,22 @@ class GameManager:
             save_results(self.current_year, "World_Championship", results_text)
             
             # Ask user if they want to generate yearly summary
-            while True:
-                choice = input("\nWould you like to generate an AI-written yearly summary? (y/n): ").lower()
-                if choice in ['y', 'n']:
-                    break
-                print("Invalid input. Please enter 'y' or 'n'.")
+            if self.generate_summaries is None:
+                while True:
+                    choice = input("\nWould you like to generate an AI-written yearly summary? (y/n): ").lower()
+                    if choice in ['y', 'n']:
+                        break
+                    print("Invalid input. Please enter 'y' or 'n'.")
+            else:
+                choice = 'y' if self.generate_summaries else 'n'
             
             if choice == 'y':
                 print("\nGenerating yearly summary...")
-                summary = generate_yearly_summary(self.current_year)
+                print("\nYEARLY SUMMARY")
+                print("=" * 50)
+                # Articles are printed as they are written
+                summary = generate_yearly_summary(self.current_year, source=self, stream=True)
                 if summary:
-                    print("\nYEARLY SUMMARY")
-                    print("=" * 50)
-                    print(summary)
                     print("=" * 50)
                 else:
                     print("Error: Failed to generate yearly summary")
@@ -141,8 +214,10 @@ class GameManager:
 
     def simulate_initial_off_season(self):
         print(f"Simulating initial {self.current_phase} for year {self.current_year}...")
-        for league in self.leagues:
-            league.run_off_season()
+        with timer(f"phase/{self.current_phase}"), self._profile(self.current_phase):
+            self.run_league_phase(self.current_phase)
+        if self.memory is not None:
+            self.memory.snapshot(self.current_year, self.current_phase)
         print(f"Initial {self.current_phase} simulation complete.")
 
     def run_season_end(self):
@@ -0,0 +1,153 @@
+from functools import lru_cache
+from math import comb
+import random
+import numpy as np
+from .strength import MASKS as _MASKS, POPCOUNT as _POPCOUNT, TEAM_SIZE as _TEAM_SIZE
+from .strength import encounter_probabilities, subset_strengths
+
+MAX_GROUP_SIZE = 3
+ROUNDS_TO_WIN = 13
+OVERTIME_TOLERANCE = 1e-12  # Overtime scorelines less likely than this are left out
+
+
+@lru_cache(maxsize=None)
+def _layer(size, max_group):
+    """Return the masks of a given size, their possible groups and group weights.
+
+    Group sizes are drawn uniformly from 1..max_group and members uniformly
+    from the alive players, so each group's weight is 1 / (max_group * C(size, k)).
+    """
+    masks = _MASKS[_POPCOUNT == size]
+    groups = np.array([
+        [sub for sub in range(1, mask + 1) if sub & mask == sub and _POPCOUNT[sub] <= max_group]
+        for mask in masks
+    ])
+    weights = 1 / (max_group * np.vectorize(comb)(size, _POPCOUNT[groups]))
+    return masks, groups, weights
+
+
+def _round_win_table(home_skills, away_skills):
+    """Return the home win probability from every (home alive, away alive) state."""
+    table = encounter_probabilities(subset_strengths(home_skills), subset_strengths(away_skills))
+    win = np.zeros((len(_MASKS), len(_MASKS)))
+    win[1:, 0] = 1.0  # Away team eliminated
+
+    # Each encounter removes at least one player, so states can be solved in
+    # order of alive players once the smaller states are known
+    for home_alive in range(1, _TEAM_SIZE + 1):
+        for away_alive in range(1, _TEAM_SIZE + 1):
+            max_group = min(MAX_GROUP_SIZE, home_alive, away_alive)
+            home_masks, home_groups, home_weights = _layer(home_alive, max_group)
+            away_masks, away_groups, away_weights = _layer(away_alive, max_group)
+
+            home_wins = table[home_groups[:, None, :, None], away_groups[None, :, None, :]]
+            after_home_win = win[home_masks[:, None, None], (away_masks[:, None] ^ away_groups)[None, :, :]]
+            after_away_win = win[(home_masks[:, None] ^ home_groups)[:, None, :], away_masks[None, :, None]]
+            outcome = (home_wins * after_home_win[:, :, None, :]
+                       + (1 - home_wins) * after_away_win[:, :, :, None])
+            win[home_masks[:, None], away_masks[None, :]] = np.einsum(
+                'ig,jh,ijgh->ij', home_weights, away_weights, outcome
+            )
+    return win
+
+
+@lru_cache(maxsize=65536)
+def _round_win_probability(home_skills, away_skills):
+    return float(_round_win_table(home_skills, away_skills)[-1, -1])
+
+
+def round_win_probability(home_skills, away_skills):
+    """Return the exact probability that the home team wins a round.
+
+    Takes each side's effective skills on the map. Groups are drawn
+    uniformly, so only the multiset of skills matters and the result is
+    cached on the sorted skills.
+    """
+    return _round_win_probability(tuple(sorted(home_skills)), tuple(sorted(away_skills)))
+
+
+@lru_cache(maxsize=65536)
+def _regulation_distribution(p):
+    """Return the probability of every final regulation scoreline and of reaching 12-12."""
+    reach = np.zeros((ROUNDS_TO_WIN + 1, ROUNDS_TO_WIN + 1))
+    reach[0, 0] = 1.0
+    for home in range(ROUNDS_TO_WIN):
+        for away in range(ROUNDS_TO_WIN):
+            if home == away == ROUNDS_TO_WIN - 1:
+                continue  # Overtime
+            reach[home + 1, away] += reach[home, away] * p
+            reach[home, away + 1] += reach[home, away] * (1 - p)
+
+    final = {}
+    for other in range(ROUNDS_TO_WIN - 1):
+        final[(ROUNDS_TO_WIN, other)] = reach[ROUNDS_TO_WIN, other]
+        final[(other, ROUNDS_TO_WIN)] = reach[other, ROUNDS_TO_WIN]
+    overtime = reach[ROUNDS_TO_WIN - 1, ROUNDS_TO_WIN - 1]
+    return final, overtime
+
+
+def scoreline_distribution(p):
+    """Return the exact distribution of final map scores for a round win probability p.
+
+    From 12-12 every pair of rounds either ends the map (14-12 or 12-14) or
+    returns to a tie, so overtime scorelines form a geometric series. Pairs
+    are added until the remaining probability drops below OVERTIME_TOLERANCE.
+    """
+    final, overtime = _regulation_distribution(p)
+    distribution = dict(final)
+    q = 1 - p
+    tie = 2 * p * q
+    base = ROUNDS_TO_WIN - 1
+    extra = 0
+    while overtime > OVERTIME_TOLERANCE:
+        distribution[(base + extra + 2, base + extra)] = overtime * p * p
+        distribution[(base + extra, base + extra + 2)] = overtime * q * q
+        overtime *= tie
+        extra += 1
+    return distribution
+
+
+def map_win_probability(p):
+    """Return the probability that the home team wins a map."""
+    final, overtime = _regulation_distribution(p)
+    regulation = sum(prob for (home, away), prob in final.items() if home > away)
+    q = 1 - p
+    return regulation + overtime * p * p / (p * p + q * q)
+
+
+def series_win_probability(map_probs, games_to_win):
+    """Return the probability that the home team wins a series played on maps in order."""
+    # Probability of each unfinished series score, from the home team's side
+    states = {(0, 0): 1.0}
+    home_total = 0.0
+    for map_prob in map_probs:
+        next_states = {}
+        for (home, away), prob in states.items():
+            for won, chance in ((True, map_prob), (False, 1 - map_prob)):
+                score = (home + 1, away) if won else (home, away + 1)
+                if score[0] == games_to_win:
+                    home_total += prob * chance
+                elif score[1] < games_to_win:
+                    next_states[score] = next_states.get(score, 0.0) + prob * chance
+        states = next_states
+    return home_total
+
+
+def sample_scoreline(p, rng=random):
+    """Sample a final map score directly from the exact scoreline distribution."""
+    final, overtime = _regulation_distribution(p)
+    draw = rng.random()
+    for score, prob in final.items():
+        if draw < prob:
+            return score
+        draw -= prob
+
+    # Overtime: tied pairs are geometric, then the map ends 2 rounds apart
+    q = 1 - p
+    extra = 0
+    while rng.random() < 2 * p * q:
+        extra += 1
+    base = ROUNDS_TO_WIN - 1 + extra
+    if rng.random() < p * p / (p * p + q * q):
+        return base + 2, base
+    return base, base + 2
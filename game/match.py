@@ -1,11 +1,38 @@
-import random
 from .team import Team
 from .player import Player
-import os
+from .rng import RandomStream
+from .utils import results_output_enabled
+from .stats import get_stats_sink
+from . import metrics
+from . import markov, strength, vectorized
 from datetime import datetime
 
+# Simulation engines: 'round' plays every encounter in Python, 'vectorized'
+# runs whole maps with NumPy (see game/vectorized.py) and 'markov' samples
+# each map's final score from its exact distribution (see game/markov.py),
+# without round details or player statistics
+ENGINES = ('round', 'vectorized', 'markov')
+
+
+def get_map_differentials(home_team, away_team, maps=Player.MAPS):
+    """Return the home team's map score minus the away team's for each map, as used in pick/ban.
+
+    A team's map score is +2 per own player who likes the map, -2 per own
+    player who dislikes it and the reverse at half weight for the opponent's
+    players, so the differential is 3 times the difference in preferences.
+    Preferences are cached per team until its roster changes.
+    """
+    home = home_team.get_map_preferences()
+    away = away_team.get_map_preferences()
+    return {map_name: 3 * (home[map_name] - away[map_name]) for map_name in maps}
+
 class Match:
-    def __init__(self, home_team: Team, away_team: Team, best_of=3, upper_loser=None, match_type='R', current_year=None):
+    default_engine = 'round'
+    # Compact history keeps only the seed and a summary (scores, map sequence,
+    # K/D/A) of each map; round details are regenerated by replay() on demand
+    compact_history = False
+
+    def __init__(self, home_team: Team, away_team: Team, best_of=3, upper_loser=None, match_type='R', current_year=None, engine=None, rng=None, compact=None):
         self.home_team = home_team
         self.away_team = away_team
         self.best_of = best_of
@@ -14,30 +41,30 @@ class Match:
         self.upper_loser = upper_loser  # Track which team came from upper bracket
         self.match_type = match_type
         self.current_year = current_year
-
-    def _calculate_map_scores(self, team: Team, opponent: Team) -> dict:
-        """Calculate strategic scores for each map based on team strengths/weaknesses."""
-        map_scores = {map_name: 0 for map_name in self.available_maps}
-        
-        # Evaluate own team's strengths/weaknesses
-        for player in team.players:
-            for map_name in self.available_maps:
-                modifier = player.get_map_skill_modifier(map_name)
-                if modifier > 0:
-                    map_scores[map_name] += 2
-                elif modifier < 0:
-                    map_scores[map_name] -= 2
-        
-        # Evaluate opponent's strengths/weaknesses
-        for player in opponent.players:
-            for map_name in self.available_maps:
-                modifier = player.get_map_skill_modifier(map_name)
-                if modifier > 0:
-                    map_scores[map_name] -= 1
-                elif modifier < 0:
-                    map_scores[map_name] += 1
-                    
-        return map_scores
+        self.engine = engine or Match.default_engine
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown simulation engine: {self.engine}")
+        # The match draws only from its own stream, so creating a new match
+        # with RandomStream(match.seed) replays it exactly
+        self.rng = rng or RandomStream()
+        self.seed = self.rng.seed_sequence
+        self.compact = Match.compact_history if compact is None else compact
+        self._write_stats = True
+        self._vectorized_maps = {}  # Maps pre-simulated by the vectorized engine
+        self._encounter_probs = None
+        self._encounter_key = None
+        self._player_bits = {}
+
+    @classmethod
+    def set_default_engine(cls, engine):
+        """Select the simulation engine used by matches that don't pick one."""
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown simulation engine: {engine}")
+        cls.default_engine = engine
+
+    def get_map_differentials(self) -> dict:
+        """Return the home team's map score minus the away team's for every available map."""
+        return get_map_differentials(self.home_team, self.away_team, self.available_maps)
 
     def _get_best_map(self, available_maps: list, map_scores: dict) -> str:
         """Return the map with the highest score from available maps."""
@@ -52,15 +79,8 @@ class Match:
         available_maps = self.available_maps.copy()
         map_sequence = []
         
-        # Calculate base map scores for both teams
-        home_map_scores = self._calculate_map_scores(self.home_team, self.away_team)
-        away_map_scores = self._calculate_map_scores(self.away_team, self.home_team)
-        
-        # Calculate differential scores (home perspective)
-        map_differentials = {
-            map_name: home_map_scores[map_name] - away_map_scores[map_name]
-            for map_name in available_maps
-        }
+        # Differential map scores (home perspective)
+        map_differentials = self.get_map_differentials()
 
         def _get_best_differential_map(maps, team_is_home):
             """Returns map with highest differential for given team"""
@@ -149,30 +169,74 @@ class Match:
 
             return [map3, map4, map5, map6, map7], map_sequence
 
+    def _get_encounter_probs(self):
+        """Return home win probabilities indexed by [map][home group][away group].
+
+        Built from both teams' subset strength tables when the match starts and
+        rebuilt if either team's roster or skills change.
+        """
+        key = (self.home_team.version, self.away_team.version)
+        if self._encounter_key != key:
+            probs = strength.encounter_probabilities(
+                self.home_team.get_subset_strengths(),
+                self.away_team.get_subset_strengths()
+            )
+            self._encounter_probs = probs.tolist()  # Nested lists index faster than arrays
+            self._player_bits = {}
+            for team in (self.home_team, self.away_team):
+                for i, player in enumerate(team.players):
+                    self._player_bits[player] = 1 << i
+            self._encounter_key = key
+        return self._encounter_probs
+
     def play(self):
         if self.result:
             return self.result
             
+        # The players as they are now, so replay() doesn't depend on later changes
+        lineups = {
+            'home_team': {player.id: player.lineup_row() for player in self.home_team.players},
+            'away_team': {player.id: player.lineup_row() for player in self.away_team.players}
+        }
+        if self.engine == 'round':
+            self._get_encounter_probs()  # Only the round engine uses the encounter tables
         maps_to_play, map_sequence = self._pick_ban_maps()
         home_wins = 0
         away_wins = 0
         games_to_win = (self.best_of // 2) + 1
         games_played = []
 
+        if self.engine == 'vectorized':
+            # Simulate every map that could be played in a single batch
+            self._vectorized_maps = dict(zip(maps_to_play, self._simulate_maps_vectorized(maps_to_play)))
+
         for current_map in maps_to_play:
             if home_wins < games_to_win and away_wins < games_to_win:
-                home_score, away_score, round_details = self.simulate_game(current_map)
-                games_played.append({
+                home_score, away_score, round_details, map_stats = self._simulate_map(current_map)
+                game = {
                     'map': current_map,
                     'score': (home_score, away_score),
-                    'rounds': round_details
-                })
+                    'stats': self._summarize_stats(map_stats)
+                }
+                if not self.compact:
+                    game['rounds'] = round_details
+                games_played.append(game)
 
                 if home_score > away_score:
                     home_wins += 1
                 else:
                     away_wins += 1
 
+        # Release per-match tables; finished matches are kept for the whole season
+        self._vectorized_maps.clear()  # Drop maps the series didn't need
+        self._encounter_probs = None
+        self._encounter_key = None
+        self._player_bits = {}
+        if self.compact:
+            self.rng = None  # replay() starts a fresh stream from self.seed
+
+        metrics.count('matches')
+
         winner = self.home_team if home_wins > away_wins else self.away_team
         loser = self.away_team if home_wins > away_wins else self.home_team
 
@@ -184,59 +248,152 @@ class Match:
             'winner': winner,
             'loser': loser,
             'games': games_played,
-            'map_sequence': map_sequence
+            'map_sequence': map_sequence,
+            # Player ID -> Player.lineup_row() per side; the stats are keyed by the same IDs
+            'lineups': lineups,
+            # Kept so results can be rendered without recomputing them
+            'map_differentials': self.get_map_differentials()
         }
         return self.result
 
-    def _create_stats_file(self, region):
-        """Create directory structure and return file path for match statistics."""
-        # Ensure we have a valid current_year
-        if not self.current_year:
-            raise ValueError("current_year must be set for match statistics")
-            
-        # For World Championship matches, use a special folder
-        if self.match_type in ['G', 'K']:
-            base_path = f"previous_results/{self.current_year}/World_Championship"
-        else:
-            base_path = f"previous_results/{self.current_year}/{region}"
-            
-        os.makedirs(base_path, exist_ok=True)
-        
-        # For World Championship matches, add stage information to filename
-        if self.match_type == 'G':
-            filename = f"{self.home_team.name}_{self.away_team.name}_Group.txt"
-        elif self.match_type == 'K':
-            filename = f"{self.home_team.name}_{self.away_team.name}_Knockout.txt"
-        else:
-            filename = f"{self.home_team.name}_{self.away_team.name}_{self.match_type}.txt"
-            
-        return os.path.join(base_path, filename)
-        
-    def _write_map_stats(self, filepath, map_name, map_stats):
-        """Write statistics for a single map to the file."""
-        with open(filepath, 'a', encoding='utf-8') as f:
-            f.write(f"\nMap: {map_name}\n")
-            f.write("-" * 13 + "\n")
-            
-            # Write home team stats
-            f.write(f"{self.home_team.name}\n")
-            f.write("-" * 13 + "\n")
-            f.write("Player Name, K, D, A\n")
-            for player, stats in map_stats['home_team'].items():
-                f.write(f"{player}, {stats['K']}, {stats['D']}, {stats['A']}\n")
-            
-            f.write("\n")
-            
-            # Write away team stats
-            f.write(f"{self.away_team.name}\n")
-            f.write("-" * 13 + "\n")
-            f.write("Player Name, K, D, A\n")
-            for player, stats in map_stats['away_team'].items():
-                f.write(f"{player}, {stats['K']}, {stats['D']}, {stats['A']}\n")
-            
-            f.write("\n" + "=" * 30 + "\n")
+    def replay(self):
+        """Re-simulate the match from its seed and return the full result with round details.
+
+        Nothing is written to disk. The match is played again by stand-ins
+        built from the lineups recorded when it was played (see
+        Team.from_lineup), so later roster and skill changes don't affect it.
+        The result refers to the real teams and player IDs; the players in
+        round details are the stand-ins.
+        """
+        if self.result is None:
+            raise ValueError("Match has not been played yet")
+        lineups = self.result['lineups']
+        home = Team.from_lineup(self.home_team.name, self.home_team.region, list(lineups['home_team'].values()))
+        away = Team.from_lineup(self.away_team.name, self.away_team.region, list(lineups['away_team'].values()))
+
+        match = Match(
+            home, away,
+            best_of=self.best_of,
+            upper_loser={self.home_team: home, self.away_team: away}.get(self.upper_loser),
+            match_type=self.match_type,
+            current_year=self.current_year,
+            engine=self.engine,
+            rng=RandomStream(self.seed),
+            compact=False
+        )
+        match._write_stats = False
+        result = match.play()
+
+        # Map the stand-ins back to the real teams and player IDs
+        teams = {home: self.home_team, away: self.away_team}
+        player_ids = {
+            'home_team': dict(zip(home.player_ids.tolist(), lineups['home_team'])),
+            'away_team': dict(zip(away.player_ids.tolist(), lineups['away_team']))
+        }
+        for key in ('home_team', 'away_team', 'winner', 'loser'):
+            result[key] = teams[result[key]]
+        result['map_sequence'] = [(action, teams.get(team), map_name)
+                                  for action, team, map_name in result['map_sequence']]
+        result['lineups'] = lineups
+        for game in result['games']:
+            if game['stats'] is not None:
+                game['stats'] = {
+                    team_key: {player_ids[team_key][player_id]: stats for player_id, stats in team_stats.items()}
+                    for team_key, team_stats in game['stats'].items()
+                }
+            for round_info in game['rounds']:
+                round_info['winner'] = teams[round_info['winner']]
+        return result
+
+    def get_rounds(self, game_index):
+        """Return the round details of a map, replaying the match if they weren't kept."""
+        game = self.play()['games'][game_index]
+        if 'rounds' in game:
+            return game['rounds']
+        return self.replay()['games'][game_index]['rounds']
+
+    def _summarize_stats(self, map_stats):
+        """Return K/D/A keyed by player ID, so results don't hold Player objects."""
+        if map_stats is None:
+            return None
+        return {
+            team_key: {player.id: dict(stats) for player, stats in team_stats.items()}
+            for team_key, team_stats in map_stats.items()
+        }
+
+    def get_win_probability(self):
+        """Return the home team's exact chance of winning the series, without simulating it."""
+        maps_to_play, _ = self._pick_ban_maps()
+        map_probs = [markov.map_win_probability(self._round_win_probability(m)) for m in maps_to_play]
+        return markov.series_win_probability(map_probs, (self.best_of // 2) + 1)
+
+    def _round_win_probability(self, current_map):
+        """Return the home team's exact chance of winning a round on a map."""
+        return markov.round_win_probability(
+            self.home_team.get_map_skills(current_map),
+            self.away_team.get_map_skills(current_map)
+        )
 
     def simulate_game(self, current_map):
+        home_score, away_score, round_details, _ = self._simulate_map(current_map)
+        return home_score, away_score, round_details
+
+    def _simulate_map(self, current_map):
+        """Simulate a map with the match's engine and write its statistics."""
+        if self.engine == 'markov':
+            home_score, away_score, round_details, map_stats = self._simulate_game_markov(current_map)
+        elif self.engine == 'vectorized':
+            home_score, away_score, round_details, map_stats = self._simulate_game_vectorized(current_map)
+        else:
+            home_score, away_score, round_details, map_stats = self._simulate_game_rounds(current_map)
+            if metrics.metrics_enabled():
+                metrics.count('rounds', len(round_details))
+                metrics.count('encounters', sum(len(round_info['encounters']) for round_info in round_details))
+        metrics.count('maps')
+
+        # Write map statistics to file
+        if map_stats is not None and self._write_stats and results_output_enabled():
+            get_stats_sink().record(self, current_map, map_stats)
+
+        return home_score, away_score, round_details, map_stats
+
+    def _simulate_game_markov(self, current_map):
+        """Sample the final map score from the exact scoreline distribution."""
+        home_score, away_score = markov.sample_scoreline(self._round_win_probability(current_map), self.rng)
+        return home_score, away_score, [], None
+
+    def _simulate_maps_vectorized(self, maps):
+        """Simulate several maps at once with the NumPy engine."""
+        home_skills = [vectorized.effective_skills(self.home_team, map_name) for map_name in maps]
+        away_skills = [vectorized.effective_skills(self.away_team, map_name) for map_name in maps]
+        return vectorized.simulate_maps(home_skills, away_skills, self.rng.numpy)
+
+    def _simulate_game_vectorized(self, current_map):
+        """Simulate a map with the NumPy engine, returning the same outputs as the round engine."""
+        if current_map in self._vectorized_maps:
+            map_result = self._vectorized_maps.pop(current_map)
+        else:
+            map_result = self._simulate_maps_vectorized([current_map])[0]
+
+        round_details = [
+            {'winner': self.home_team if home_won else self.away_team, 'map': current_map}
+            for home_won in map_result['home_won']
+        ]
+
+        players = self.home_team.players + self.away_team.players
+        map_stats = {'home_team': {}, 'away_team': {}}
+        for i, player in enumerate(players):
+            team_key = 'home_team' if i < len(self.home_team.players) else 'away_team'
+            map_stats[team_key][player] = {
+                'K': int(map_result['kills'][i]),
+                'D': int(map_result['deaths'][i]),
+                'A': int(map_result['assists'][i])
+            }
+
+        return map_result['home_score'], map_result['away_score'], round_details, map_stats
+
+    def _simulate_game_rounds(self, current_map):
+        """Simulate a map round by round."""
         home_score = 0
         away_score = 0
         round_details = []
@@ -269,11 +426,7 @@ class Match:
                     else:
                         away_score += 1
 
-        # Write map statistics to file
-        stats_file = self._create_stats_file(self.home_team.region)
-        self._write_map_stats(stats_file, current_map, map_stats)
-
-        return home_score, away_score, round_details
+        return home_score, away_score, round_details, map_stats
 
     def _update_stats(self, round_info, map_stats):
         """Update map statistics based on round results."""
@@ -281,19 +434,19 @@ class Match:
             # Select one winner to get the kills (first player in winners list)
             if encounter['winners']:
                 killer = encounter['winners'][0]
-                team_key = 'home_team' if killer in self.home_team.players else 'away_team'
+                team_key = 'home_team' if killer.team is self.home_team else 'away_team'
                 # Award kills only to the primary killer
                 map_stats[team_key][killer]['K'] += len(encounter['losers'])
             
             # Update deaths for losers
             for loser in encounter['losers']:
-                team_key = 'home_team' if loser in self.home_team.players else 'away_team'
+                team_key = 'home_team' if loser.team is self.home_team else 'away_team'
                 map_stats[team_key][loser]['D'] += 1
             
             # Update assists for other winners
             for winner in encounter['winners'][1:]:  # Skip the killer, only process potential assisters
-                team_key = 'home_team' if winner in self.home_team.players else 'away_team'
-                if random.random() < 0.35:  # 35% chance for assist
+                team_key = 'home_team' if winner.team is self.home_team else 'away_team'
+                if self.rng.random() < 0.35:  # 35% chance for assist
                     map_stats[team_key][winner]['A'] += len(encounter['losers'])
 
     def simulate_round(self, current_map):
@@ -304,12 +457,12 @@ class Match:
         while home_alive and away_alive:
             # Determine group sizes based on available players
             max_group_size = min(3, len(home_alive), len(away_alive))
-            home_group_size = random.randint(1, max_group_size)
-            away_group_size = random.randint(1, max_group_size)
+            home_group_size = self.rng.randint(1, max_group_size)
+            away_group_size = self.rng.randint(1, max_group_size)
             
             # Select random players for each group
-            home_group = random.sample(home_alive, home_group_size)
-            away_group = random.sample(away_alive, away_group_size)
+            home_group = self.rng.sample(home_alive, home_group_size)
+            away_group = self.rng.sample(away_alive, away_group_size)
             
             winners, losers = self.simulate_group_encounter(home_group, away_group, current_map)
             encounters.append(({
@@ -337,25 +490,14 @@ class Match:
 
     def simulate_group_encounter(self, home_group: list, away_group: list, current_map: str):
         """Simulate an encounter between two groups of players."""
-        # Calculate numerical advantage bonus (0.1 per player advantage)
-        number_advantage = (len(home_group) - len(away_group)) * 0.1
-        
-        # Calculate total effective skill for each group
-        home_skill = sum(p.skill + p.get_map_skill_modifier(current_map) for p in home_group)
-        away_skill = sum(p.skill + p.get_map_skill_modifier(current_map) for p in away_group)
-        
-        # Apply numerical advantage bonus
-        if number_advantage > 0:
-            home_skill *= (1 + number_advantage)
-        elif number_advantage < 0:
-            away_skill *= (1 + abs(number_advantage))
-        
-        # Calculate win probability
-        total_skill = home_skill + away_skill
-        home_win_prob = home_skill / total_skill
-        home_win_prob = max(0.1, min(0.9, home_win_prob))  # Clamp between 0.1 and 0.9
+        # The table already includes the numbers advantage bonus and the
+        # 0.1-0.9 clamp (see strength.encounter_probabilities)
+        probs = self._get_encounter_probs()
+        home_mask = sum(self._player_bits[p] for p in home_group)
+        away_mask = sum(self._player_bits[p] for p in away_group)
+        home_win_prob = probs[strength.MAP_INDEX[current_map]][home_mask][away_mask]
         
-        if random.random() < home_win_prob:
+        if self.rng.random() < home_win_prob:
             return home_group, away_group
         else:
             return away_group, home_group
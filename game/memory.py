@@ -0,0 +1,111 @@
+import gc
+import json
+import os
+import tracemalloc
+
+from .match import Match
+
+DEFAULT_MEMORY_REPORT = os.path.join("previous_results", "memory.jsonl")
+# The report's own allocations
+_IGNORED_FILES = {tracemalloc.__file__, __file__}
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+def count_live_objects():
+    """Count live Match objects, match result dicts, round records and encounter records."""
+    counts = {'matches': 0, 'results': 0, 'rounds': 0, 'encounters': 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, Match):
+            counts['matches'] += 1
+        elif type(obj) is dict:
+            if 'games' in obj and 'winner' in obj:
+                counts['results'] += 1
+            elif 'home_group' in obj:
+                counts['encounters'] += 1
+            elif 'winner' in obj and 'map' in obj:
+                # Round engine rounds also hold 'encounters'; vectorized ones only these two keys
+                counts['rounds'] += 1
+    return counts
+
+
+def _site(stat):
+    frame = stat.traceback[0]
+    filename = frame.filename
+    if filename.startswith(_PROJECT_DIR):
+        filename = os.path.relpath(filename, _PROJECT_DIR)
+    return f"{filename}:{frame.lineno}"
+
+
+class MemoryTracker:
+    """Takes tracemalloc snapshots at phase boundaries and reports what is still alive.
+
+    Each snapshot() appends a JSON line to `path` with the traced memory,
+    the top allocation sites by size, the sites that grew most since the
+    previous snapshot and counts of live Match objects, result dicts, round
+    records and encounter records. Tracing slows the simulation down, so
+    this is for diagnosing growth in long runs, not for timing.
+    """
+
+    def __init__(self, path=DEFAULT_MEMORY_REPORT, top=10):
+        self.path = path
+        self.top = top
+        self.entries = []
+        self._previous = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def snapshot(self, year, phase):
+        """Record memory at the end of a phase and return the report entry."""
+        gc.collect()  # Only count what is actually reachable
+        current, peak = tracemalloc.get_traced_memory()
+        # Grouping the traces is the slow part, so it is done once and the
+        # growth is worked out from the previous snapshot's grouped sites
+        sites = {
+            _site(stat): (stat.size, stat.count)
+            for stat in tracemalloc.take_snapshot().statistics('lineno')
+            if stat.traceback[0].filename not in _IGNORED_FILES
+        }
+        entry = {
+            'year': year,
+            'phase': phase,
+            'traced_kb': round(current / 1024),
+            'peak_kb': round(peak / 1024),
+            'live': count_live_objects(),
+            'top_sites': self._top(sites)
+        }
+        if self._previous is not None:
+            growth = {
+                site: (size - self._previous.get(site, (0, 0))[0], count - self._previous.get(site, (0, 0))[1])
+                for site, (size, count) in sites.items()
+            }
+            entry['growth'] = [row for row in self._top(growth) if row['kb'] > 0]
+        self._previous = sites
+        tracemalloc.reset_peak()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        self.entries.append(entry)
+        return entry
+
+    def _top(self, sites):
+        largest = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+        return [{'site': site, 'kb': round(size / 1024, 1), 'blocks': count} for site, (size, count) in largest]
+
+    def close(self):
+        tracemalloc.stop()
+        self._previous = None
+
+    def format_summary(self, phase=None):
+        """Return a table of traced memory and live object counts per snapshot, or only a phase's."""
+        lines = [f"{'Year':<6}{'Phase':<20}{'Traced KB':>10}{'Peak KB':>10}"
+                 f"{'Matches':>9}{'Results':>9}{'Rounds':>9}{'Encounters':>12}"]
+        for entry in self.entries:
+            if phase is not None and entry['phase'] != phase:
+                continue
+            live = entry['live']
+            lines.append(f"{entry['year']:<6}{entry['phase']:<20}{entry['traced_kb']:>10}{entry['peak_kb']:>10}"
+                         f"{live['matches']:>9}{live['results']:>9}{live['rounds']:>9}{live['encounters']:>12}")
+        return "\n".join(lines)
@@ -0,0 +1,134 @@
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+# Disabled until enable_metrics() is called; every hook then returns at once
+_metrics = None
+_NULL_TIMER = nullcontext()
+
+
+class Metrics:
+    """Wall and CPU time per named section and simulation counters.
+
+    Timer names are paths like 'phase/Regular Season', 'league/Europe/Playoffs'
+    or 'stage/Playoffs/Upper Bracket'; each keeps its number of calls and
+    total seconds. CPU time is for this process only, so with worker
+    processes the per-league timers (measured in the workers) carry it.
+    """
+
+    def __init__(self):
+        self.timers = {}
+        self.counters = {}
+
+    def add_time(self, name, wall, cpu, calls=1):
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+        timer['calls'] += calls
+        timer['wall'] += wall
+        timer['cpu'] += cpu
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, data):
+        """Add the timers and counters from another registry's to_dict()."""
+        for name, timer in data['timers'].items():
+            self.add_time(name, timer['wall'], timer['cpu'], timer['calls'])
+        for name, amount in data['counters'].items():
+            self.count(name, amount)
+
+    def to_dict(self):
+        return {
+            'timers': {name: dict(timer) for name, timer in sorted(self.timers.items())},
+            'counters': dict(sorted(self.counters.items()))
+        }
+
+
+class _Timer:
+    __slots__ = ('name', 'wall', 'cpu')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        if _metrics is not None:
+            _metrics.add_time(self.name, time.perf_counter() - self.wall, time.process_time() - self.cpu)
+
+
+def enable_metrics(enabled=True):
+    """Start collecting metrics in a new, empty registry, or stop collecting them."""
+    global _metrics
+    _metrics = Metrics() if enabled else None
+
+
+def metrics_enabled():
+    return _metrics is not None
+
+
+def get_metrics():
+    """Return the current registry, or None when metrics are disabled."""
+    return _metrics
+
+
+@contextmanager
+def paused_metrics():
+    """Record nothing inside the block, keeping the current registry for afterwards."""
+    global _metrics
+    previous, _metrics = _metrics, None
+    try:
+        yield
+    finally:
+        _metrics = previous
+
+
+def timer(name):
+    """Return a context manager that adds its block's wall and CPU time to the named timer."""
+    if _metrics is None:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name, amount=1):
+    if _metrics is not None:
+        _metrics.count(name, amount)
+
+
+def add_time(name, wall, cpu=0.0):
+    """Add a duration measured elsewhere, e.g. a model request, to the named timer."""
+    if _metrics is not None:
+        _metrics.add_time(name, wall, cpu)
+
+
+def take_metrics():
+    """Return the current registry's to_dict() and start a new one, or None when disabled."""
+    global _metrics
+    if _metrics is None:
+        return None
+    data = _metrics.to_dict()
+    _metrics = Metrics()
+    return data
+
+
+def merge_metrics(data):
+    if _metrics is not None and data is not None:
+        _metrics.merge(data)
+
+
+def save_metrics(year):
+    """Write the year's metrics to previous_results/<year>/metrics.json and start a new registry."""
+    data = take_metrics()
+    if data is None:
+        return None
+    year_dir = os.path.join("previous_results", str(year))
+    os.makedirs(year_dir, exist_ok=True)
+    path = os.path.join(year_dir, "metrics.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'year': year, **data}, f, indent=2)
+    return path
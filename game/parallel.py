@@ -0,0 +1,88 @@
+import contextlib
+import io
+
+from .match import Match
+from .metrics import metrics_enabled, enable_metrics, timer, take_metrics, merge_metrics
+from .stats import get_stats_sink, set_stats_sink
+from .utils import results_output_enabled, set_results_output
+
+# Phases run per league; leagues share no state until Worlds
+LEAGUE_PHASES = ("Off-Season", "Regular Season", "Playoffs")
+# The Off-Season creates players, and player IDs are handed out by each
+# process's registry (see game/registry.py), so it always runs in the parent
+PARALLEL_PHASES = ("Regular Season", "Playoffs")
+
+
+def get_settings():
+    """Return the module-level simulation settings a worker process needs."""
+    return {
+        'engine': Match.default_engine,
+        'compact_history': Match.compact_history,
+        'results_output': results_output_enabled(),
+        'stats_sink': get_stats_sink().name,
+        'metrics': metrics_enabled()
+    }
+
+
+def apply_settings(settings):
+    Match.set_default_engine(settings['engine'])
+    Match.compact_history = settings['compact_history']
+    set_results_output(settings['results_output'])
+    if settings['stats_sink'] != get_stats_sink().name:
+        set_stats_sink(settings['stats_sink'])
+    if settings['metrics'] != metrics_enabled():
+        enable_metrics(settings['metrics'])
+
+
+@contextlib.contextmanager
+def simulation_settings(**overrides):
+    """Temporarily override simulation settings, restoring them afterwards."""
+    previous = get_settings()
+    apply_settings({**previous, **overrides})
+    try:
+        yield
+    finally:
+        apply_settings(previous)
+
+
+def run_league_phase(league, phase):
+    """Run one league's part of a phase."""
+    if phase not in LEAGUE_PHASES:
+        raise ValueError(f"{phase} can't be run per league")
+    with timer(f"league/{league.name}/{phase}"):
+        if phase == "Off-Season":
+            league.run_off_season()
+        elif phase == "Regular Season":
+            league.run_regular_season()
+        else:
+            league.run_playoffs()
+
+
+def _run_league_phase_worker(league, phase, settings):
+    """Worker entry point: run the phase and send the updated league back with its output and metrics."""
+    apply_settings(settings)
+    take_metrics()  # Drop anything counted by an earlier task or inherited from the parent
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        run_league_phase(league, phase)
+    # Statistics must be on disk before the parent moves on
+    get_stats_sink().close()
+    return league, output.getvalue(), take_metrics()
+
+
+def run_league_phase_parallel(executor, leagues, phase):
+    """Run a phase for every league in worker processes.
+
+    Each league draws only from its own random stream, so the results match
+    a serial run. Returns the updated leagues; their console output is
+    printed in league order and their metrics added to this process's.
+    """
+    settings = get_settings()
+    futures = [executor.submit(_run_league_phase_worker, league, phase, settings) for league in leagues]
+    updated = []
+    for future in futures:
+        league, output, metrics = future.result()
+        print(output, end='')
+        merge_metrics(metrics)
+        updated.append(league)
+    return updated
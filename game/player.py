@@ -1,78 +1,225 @@
 import random
 from .utils import get_random_name, get_random_gamer_tag, load_data
+from .rng import RandomStream
+from .registry import Registry
 import numpy as np
 
 class Player:
+    # No per-instance __dict__, to keep large player pools small; skills,
+    # contracts and map preferences live in the registry's columns
+    __slots__ = ('id', 'team', 'first_name', 'last_name', 'gamer_tag', '_map_modifiers')
+
     first_names = load_data('first_names.txt')
     last_names = load_data('last_names.txt')
     gamer_tags = load_data('gamer_tags.txt')
 
     # Add available maps as class variable
     MAPS = ['Split', 'Haven', 'Bind', 'Abyss', 'Ascent', 'Icebox', 'Lotus']
+    # A map's ID is its index in MAPS; map preferences are bit masks over the IDs
+    MAP_IDS = {map_name: i for i, map_name in enumerate(MAPS)}
+    GOOD_MAP_MODIFIER = 10
+    BAD_MAP_MODIFIER = -10
+    # Shared by every Player and Team in the process (see game/registry.py)
+    registry = Registry(len(MAPS))
 
     @staticmethod
-    def generate_skill():
+    def generate_skill(rng=None):
         # Use a normal distribution with mean 75 and standard deviation 10
-        skill = int(np.random.normal(75, 10))
+        normal = rng.numpy.normal if rng is not None else np.random.normal
+        skill = int(normal(75, 10))
         # Clamp the skill between 50 and 100
         return max(50, min(100, skill))
 
-    def __init__(self):
-        self.first_name, self.last_name = get_random_name(self.first_names, self.last_names).split()
-        self.gamer_tag = get_random_gamer_tag(self.gamer_tags)
-        self.skill = self.generate_skill()
-        self.contract_length = random.choice([1, 2, 3])
+    def __init__(self, rng=None):
+        rng = rng or RandomStream()
+        self.id = self.registry.add_player()
+        self.team = None  # Set by the Team that holds the player
+        self.first_name, self.last_name = get_random_name(self.first_names, self.last_names, rng).split()
+        self.gamer_tag = get_random_gamer_tag(self.gamer_tags, rng)
+        self.skill = self.generate_skill(rng)
+        self.contract_length = rng.choice([1, 2, 3])
         self.contract_years_left = self.contract_length
 
         # Initialize map preferences
-        self.good_maps, self.bad_maps = self._assign_map_preferences()
+        self._set_map_preferences(*self._assign_map_preferences(rng))
 
-    def _assign_map_preferences(self):
+    def _assign_map_preferences(self, rng):
         """Assign map preferences based on player skill."""
         maps = self.MAPS.copy()
-        random.shuffle(maps)
+        rng.shuffle(maps)
         
         # Calculate number of bad maps based on skill
         # Higher skill = fewer bad maps
         max_bad_maps = max(1, min(3, int((100 - self.skill) / 20)))
-        num_bad_maps = random.randint(1, max_bad_maps)
+        num_bad_maps = rng.randint(1, max_bad_maps)
         
         # Always have at least one good map
-        num_good_maps = random.randint(1, 3)
+        num_good_maps = rng.randint(1, 3)
         
-        good_maps = set(maps[:num_good_maps])
-        remaining_maps = set(maps[num_good_maps:])
-        bad_maps = set(random.sample(list(remaining_maps), num_bad_maps))
+        good_maps = maps[:num_good_maps]
+        # Sample from the shuffled list rather than a set so the draw doesn't
+        # depend on string hash order and stays reproducible
+        remaining_maps = maps[num_good_maps:]
+        bad_maps = rng.sample(remaining_maps, num_bad_maps)
         
-        return good_maps, bad_maps
+        return self._map_mask(good_maps), self._map_mask(bad_maps)
+
+    @classmethod
+    def _map_mask(cls, map_names):
+        mask = 0
+        for map_name in map_names:
+            mask |= 1 << cls.MAP_IDS[map_name]
+        return mask
+
+    @classmethod
+    def _map_names(cls, mask):
+        return {map_name for map_id, map_name in enumerate(cls.MAPS) if mask >> map_id & 1}
+
+    def _set_map_preferences(self, good_map_mask, bad_map_mask):
+        self.registry.good_map_mask[self.id] = good_map_mask
+        self.registry.bad_map_mask[self.id] = bad_map_mask
+        # Skill modifier per map ID: +10 on good maps, -10 on bad maps, 0 otherwise
+        # (a map in both counts as good). The tuple is kept on the player too,
+        # so per-map lookups don't go through NumPy
+        self._map_modifiers = tuple(
+            self.GOOD_MAP_MODIFIER if good_map_mask >> map_id & 1 else
+            self.BAD_MAP_MODIFIER if bad_map_mask >> map_id & 1 else 0
+            for map_id in range(len(self.MAPS))
+        )
+        self.registry.map_modifiers[self.id] = self._map_modifiers
+        if self.team is not None:
+            self.team.mark_changed()
+
+    @property
+    def good_map_mask(self):
+        return int(self.registry.good_map_mask[self.id])
+
+    @property
+    def bad_map_mask(self):
+        return int(self.registry.bad_map_mask[self.id])
+
+    @property
+    def map_modifiers(self):
+        """Return the skill modifier for each map ID."""
+        return self._map_modifiers
+
+    @property
+    def good_maps(self):
+        """Return the names of the player's good maps."""
+        return self._map_names(self.good_map_mask)
+
+    @good_maps.setter
+    def good_maps(self, map_names):
+        self._set_map_preferences(self._map_mask(map_names), self.bad_map_mask)
+
+    @property
+    def bad_maps(self):
+        """Return the names of the player's bad maps."""
+        return self._map_names(self.bad_map_mask)
+
+    @bad_maps.setter
+    def bad_maps(self, map_names):
+        self._set_map_preferences(self.good_map_mask, self._map_mask(map_names))
 
     @property
     def neutral_maps(self):
         """Return maps that are neither good nor bad."""
-        return set(self.MAPS) - (self.good_maps | self.bad_maps)
+        return self._map_names(~(self.good_map_mask | self.bad_map_mask))
 
     def get_map_skill_modifier(self, map_name):
         """Return skill modifier for a given map."""
-        if map_name in self.good_maps:
-            return 10  # +10 skill on good maps
-        elif map_name in self.bad_maps:
-            return -10  # -10 skill on bad maps
-        return 0  # no modifier for neutral maps
+        return self.map_modifiers[self.MAP_IDS[map_name]]
 
-    def improve(self):
+    @property
+    def skill(self):
+        return int(self.registry.skill[self.id])
+
+    @skill.setter
+    def skill(self, value):
+        self.registry.skill[self.id] = value
+        # Let the team rebuild anything computed from its players' skills
+        if self.team is not None:
+            self.team.mark_changed()
+
+    @property
+    def contract_length(self):
+        return int(self.registry.contract_length[self.id])
+
+    @contract_length.setter
+    def contract_length(self, value):
+        self.registry.contract_length[self.id] = value
+
+    @property
+    def contract_years_left(self):
+        return int(self.registry.contract_years_left[self.id])
+
+    @contract_years_left.setter
+    def contract_years_left(self, value):
+        self.registry.contract_years_left[self.id] = value
+
+    def __getstate__(self):
+        # The registry row goes with the player, so it can be rebuilt in another process
+        return {
+            'id': self.id,
+            'team': self.team,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'gamer_tag': self.gamer_tag,
+            'row': self.registry.get_row(self.id),
+            'registry': self.registry.token
+        }
+
+    def __setstate__(self, state):
+        if state.get('registry') == self.registry.token:
+            # A copy within this process gets its own row rather than sharing the original's
+            self.id = self.registry.add_player()
+        else:
+            self.id = state['id']
+        self.team = state['team']
+        self.first_name = state['first_name']
+        self.last_name = state['last_name']
+        self.gamer_tag = state['gamer_tag']
+        self.registry.set_row(self.id, state['row'])
+        self._map_modifiers = tuple(state['row']['map_modifiers'])
+
+    def lineup_row(self):
+        """Return what a match records about the player: names, skill and map modifiers."""
+        return (self.first_name, self.last_name, self.gamer_tag, self.skill, self._map_modifiers)
+
+    def improve(self, rng=random):
         # Slight improvement with a small chance of a bigger jump
-        improvement = random.choices([0, 1, 2, 3], weights=[0.4, 0.3, 0.2, 0.1])[0]
+        improvement = rng.choices([0, 1, 2, 3], weights=[0.4, 0.3, 0.2, 0.1])[0]
         self.skill = min(100, self.skill + improvement)
 
     def decrease_contract_length(self):
         self.contract_years_left -= 1
 
-    def renew_contract(self):
-        self.contract_length = random.choice([1, 2, 3])
+    def renew_contract(self, rng=random):
+        self.contract_length = rng.choice([1, 2, 3])
         self.contract_years_left = self.contract_length
 
     def __str__(self):
         return f"{self.first_name} \"{self.gamer_tag}\" {self.last_name} (Skill: {self.skill})"
 
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+class LineupPlayer(Player):
+    """A player as they were when a match was played, rebuilt from Player.lineup_row() for Match.replay.
+
+    Its row lives in the given registry rather than the shared one, so
+    replaying a match leaves the real players untouched.
+    """
+    __slots__ = ('registry',)
+
+    def __init__(self, registry, first_name, last_name, gamer_tag, skill, map_modifiers):
+        self.registry = registry
+        self.id = registry.add_player()
+        self.team = None
+        self.first_name = first_name
+        self.last_name = last_name
+        self.gamer_tag = gamer_tag
+        registry.skill[self.id] = skill
+        good_map_mask = sum(1 << map_id for map_id, modifier in enumerate(map_modifiers) if modifier > 0)
+        bad_map_mask = sum(1 << map_id for map_id, modifier in enumerate(map_modifiers) if modifier < 0)
+        self._set_map_preferences(good_map_mask, bad_map_mask)
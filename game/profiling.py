@@ -0,0 +1,184 @@
+import cProfile
+import os
+import pstats
+import signal
+import sys
+import threading
+from contextlib import contextmanager
+
+PROFILE_MODES = ('sample', 'cprofile')
+# Phase names as used in file names and on the command line
+PHASES = ("off-season", "preseason", "regular-season", "playoffs", "world-championship")
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_INTERVAL = 0.001
+
+
+def phase_slug(phase):
+    """Return the file name form of a phase, e.g. 'Regular Season' -> 'regular-season'."""
+    return phase.lower().replace(' ', '-')
+
+
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _record_stack(stacks, frame):
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    if names:
+        stack = ';'.join(reversed(names))
+        stacks[stack] = stacks.get(stack, 0) + 1
+
+
+class PhaseProfiler:
+    """Profiles GameManager phases and writes one collapsed-stack file per phase.
+
+    In 'sample' mode the stack is recorded every `interval` seconds of CPU
+    time from a SIGPROF handler (the kernel may round the interval up), or
+    where that isn't available (Windows, or off the main thread) from a
+    background thread, which can only sample when the GIL is released. In
+    'cprofile' mode each phase runs under cProfile; its stats are saved as
+    <phase>.prof and converted to collapsed stacks by splitting each
+    function's time between its callers. Collapsed
+    files have one 'frame;frame;frame count' line per stack, as read by
+    flamegraph.pl, speedscope and inferno; sample counts are samples,
+    cProfile counts are microseconds.
+
+    Repeated phases (e.g. every year's Regular Season) add to the same file.
+    Only the calling process is profiled, so league phases run with workers
+    show up as waiting on the process pool.
+    """
+
+    def __init__(self, output_dir=DEFAULT_PROFILE_DIR, mode='sample', phases=None, interval=DEFAULT_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}")
+        self.output_dir = output_dir
+        self.mode = mode
+        self.phases = set(phases or PHASES)
+        self.interval = interval
+        self._stacks = {}  # Phase -> {collapsed stack: samples}
+        self._profiles = {}  # Phase -> cProfile.Profile
+        self._current = None
+        self._sampler = None
+
+    @contextmanager
+    def profile(self, phase):
+        """Profile the block as part of a phase, if that phase was selected."""
+        phase = phase_slug(phase)
+        if phase not in self.phases or self._current is not None:
+            yield
+            return
+        self._current = phase
+        if self.mode == 'cprofile':
+            profile = self._profiles.setdefault(phase, cProfile.Profile())
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._current = None
+        else:
+            self._start_sampler()
+            try:
+                yield
+            finally:
+                self._current = None
+                self._stop_sampler()
+
+    def _start_sampler(self):
+        stacks = self._stacks.setdefault(self._current, {})
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            previous = signal.signal(signal.SIGPROF, lambda signum, frame: _record_stack(stacks, frame))
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            self._sampler = ('signal', previous)
+        else:
+            stop = threading.Event()
+            thread = threading.Thread(
+                target=self._sample_thread, args=(threading.get_ident(), stacks, stop),
+                name="phase-profiler", daemon=True
+            )
+            thread.start()
+            self._sampler = (thread, stop)
+
+    def _stop_sampler(self):
+        if self._sampler[0] == 'signal':
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._sampler[1])
+        else:
+            thread, stop = self._sampler
+            stop.set()
+            thread.join()
+        self._sampler = None
+
+    def _sample_thread(self, thread_id, stacks, stop):
+        while not stop.wait(self.interval):
+            _record_stack(stacks, sys._current_frames().get(thread_id))
+
+    def save(self):
+        """Write the collapsed stacks (and .prof files in cProfile mode) and return their paths."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+        for phase, profile in self._profiles.items():
+            path = os.path.join(self.output_dir, f"{phase}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+            self._stacks[phase] = collapse_pstats(pstats.Stats(profile))
+        for phase, stacks in self._stacks.items():
+            path = os.path.join(self.output_dir, f"{phase}.collapsed")
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in sorted(stacks.items()):
+                    if count:
+                        f.write(f"{stack} {count}\n")
+            paths.append(path)
+        return paths
+
+
+def collapse_pstats(stats):
+    """Convert cProfile stats to {collapsed stack: microseconds}.
+
+    cProfile only records caller -> callee edges, so a function's time under
+    each stack is estimated from the share of its time each caller accounts for.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+
+    def label(func):
+        filename, line, name = func
+        return f"{name} ({os.path.basename(filename)}:{line})" if line else name
+
+    stacks = {}
+
+    def walk(func, stack, seconds, on_stack):
+        _, _, own_time, total_time, _ = stats.stats[func]
+        share = seconds / total_time if total_time else 0.0
+        key = f"{stack};{label(func)}" if stack else label(func)
+        stacks[key] = stacks.get(key, 0) + int(own_time * share * 1e6)
+        for callee, edge_time in callees.get(func, {}).items():
+            if callee not in on_stack and edge_time * share > 1e-6:
+                walk(callee, key, edge_time * share, on_stack | {callee})
+
+    for root in roots:
+        walk(root, "", stats.stats[root][3], {root})
+    return stacks
+
+
+def add_profile_arguments(parser):
+    """Add the --profile options shared by main.py and game.batch."""
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_DIR, default=None, metavar="DIR",
+                        help=f"profile each phase and write collapsed stacks to DIR (default: {DEFAULT_PROFILE_DIR})")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default='sample',
+                        help="sampling profiler or cProfile (default: sample)")
+    parser.add_argument("--profile-phases", nargs="+", choices=PHASES, default=None, metavar="PHASE",
+                        help=f"phases to profile (default: all of {', '.join(PHASES)})")
+
+
+def profiler_from_args(args):
+    """Return a PhaseProfiler for the parsed --profile options, or None if profiling is off."""
+    if args.profile is None:
+        return None
+    return PhaseProfiler(args.profile, mode=args.profile_mode, phases=args.profile_phases)
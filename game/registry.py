@@ -0,0 +1,84 @@
+import os
+import uuid
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+
+class Registry:
+    """Gives every Player a stable integer ID and keeps player data in NumPy columns.
+
+    A player's skill, contract and map preferences live at its ID in
+    the columns below, so questions about many players (ratings, top
+    players, tables of map skills) are array operations. Player objects
+    read and write their own row. IDs are handed out in creation order and
+    never reused; columns grow by doubling.
+
+    Each process has its own registry. Unpickling a Player in another
+    process writes its row into that process's registry under the same ID,
+    so players can be sent to worker processes and back, but new players
+    must only be created in one process or their IDs would collide. A copy
+    made in the same process (copy.deepcopy or a pickle round trip) gets a
+    new ID instead, so it doesn't share the original's row.
+    """
+
+    def __init__(self, map_count, capacity=INITIAL_CAPACITY):
+        self.map_count = map_count
+        self.player_count = 0
+        self._uid = uuid.uuid4().hex
+        self.skill = np.zeros(capacity, dtype=np.int64)
+        self.contract_length = np.zeros(capacity, dtype=np.int64)
+        self.contract_years_left = np.zeros(capacity, dtype=np.int64)
+        self.good_map_mask = np.zeros(capacity, dtype=np.int64)
+        self.bad_map_mask = np.zeros(capacity, dtype=np.int64)
+        # Skill modifier per player and map ID
+        self.map_modifiers = np.zeros((capacity, map_count), dtype=np.int64)
+
+    _COLUMNS = ('skill', 'contract_length', 'contract_years_left', 'good_map_mask', 'bad_map_mask',
+                'map_modifiers')
+
+    def _reserve(self, count):
+        capacity = len(self.skill)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    @property
+    def token(self):
+        """Identify this registry in this process; a forked worker's copy gets a different token."""
+        return (os.getpid(), self._uid)
+
+    def add_player(self):
+        """Return the ID for a new player row."""
+        player_id = self.player_count
+        self._reserve(player_id + 1)
+        self.player_count += 1
+        return player_id
+
+    def get_row(self, player_id):
+        """Return a player's row as plain Python values, for pickling."""
+        return {name: getattr(self, name)[player_id].tolist() for name in self._COLUMNS}
+
+    def set_row(self, player_id, row):
+        """Write a player's row, e.g. one unpickled from another process or copied."""
+        self._reserve(player_id + 1)
+        self.player_count = max(self.player_count, player_id + 1)
+        for name, value in row.items():
+            getattr(self, name)[player_id] = value
+
+    def map_skills(self, player_ids):
+        """Return a (maps, players) array of skills including map modifiers."""
+        return self.skill[player_ids] + self.map_modifiers[player_ids].T
+
+    def top_players(self, player_ids, count):
+        """Return the IDs of the `count` most skilled players, ties in the given order."""
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        order = np.argsort(-self.skill[player_ids], kind='stable')
+        return player_ids[order[:count]]
@@ -0,0 +1,245 @@
+import os
+import sqlite3
+
+DEFAULT_DB_PATH = os.path.join("previous_results", "results.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    region TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    stage TEXT,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    home_rating REAL,
+    away_rating REAL,
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL,
+    winner TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS match_teams (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    year INTEGER NOT NULL,
+    region TEXT NOT NULL,
+    team TEXT NOT NULL,
+    opponent TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS maps (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    game_index INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL,
+    PRIMARY KEY (match_id, game_index)
+);
+CREATE TABLE IF NOT EXISTS map_sequence (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    step INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    team TEXT,
+    map TEXT NOT NULL,
+    PRIMARY KEY (match_id, step)
+);
+CREATE TABLE IF NOT EXISTS standings (
+    year INTEGER NOT NULL,
+    region TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    wins INTEGER,
+    losses INTEGER,
+    map_wins INTEGER,
+    map_losses INTEGER,
+    PRIMARY KEY (year, region, phase, position)
+);
+CREATE TABLE IF NOT EXISTS player_stats (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    game_index INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    player TEXT NOT NULL,
+    kills INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    assists INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_year_region ON matches (year, region, phase);
+CREATE INDEX IF NOT EXISTS idx_match_teams_year_region_team ON match_teams (year, region, team);
+CREATE INDEX IF NOT EXISTS idx_match_teams_team ON match_teams (team);
+CREATE INDEX IF NOT EXISTS idx_standings_year_region_team ON standings (year, region, team);
+CREATE INDEX IF NOT EXISTS idx_player_stats_player ON player_stats (player);
+"""
+
+
+def player_name(row):
+    """Return a player's name from a match's lineup row, without the skill that str(player) includes."""
+    first_name, last_name, gamer_tag = row[:3]
+    return f'{first_name} "{gamer_tag}" {last_name}'
+
+
+class ResultsStore:
+    """SQLite store of matches, maps, pick/ban sequences, standings and player K/D/A.
+
+    Each phase is written in a single transaction by record_phase(). Regions
+    use the same names as the results files, so the World Championship is
+    stored as 'World_Championship'.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record_phase(self, manager, phase):
+        """Write everything a GameManager phase produced in one transaction."""
+        with self.connection:
+            if phase == "Regular Season":
+                for league in manager.leagues:
+                    self._record_regular_season(league)
+            elif phase == "Playoffs":
+                for league in manager.leagues:
+                    self._record_playoffs(league)
+            elif phase == "World Championship" and manager.world_championship is not None:
+                self._record_world_championship(manager.world_championship, manager.current_year)
+
+    def _record_regular_season(self, league):
+        season = league.season
+        self._clear(season.current_year, league.name, "Regular Season")
+        for match in season.matches:
+            self._insert_match(season.current_year, league.name, "Regular Season", None, match.play())
+        rows = [
+            (season.current_year, league.name, "Regular Season", position, team.name,
+             season.standings[team]['wins'], season.standings[team]['losses'],
+             season.standings[team]['map_wins'], season.standings[team]['map_losses'])
+            for position, team in enumerate(season.get_standings(), 1)
+        ]
+        self.connection.executemany("INSERT INTO standings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _record_playoffs(self, league):
+        tournament = league.playoff_tournament
+        self._clear(league.current_year, league.name, "Playoffs")
+        for stage, result in tournament.match_results:
+            self._insert_match(league.current_year, league.name, "Playoffs", stage, result)
+        self._insert_placings(league.current_year, league.name, "Playoffs", league.playoff_results)
+
+    def _record_world_championship(self, world_championship, year):
+        self._clear(year, "World_Championship", "World Championship")
+        for stage, result in world_championship.match_results:
+            self._insert_match(year, "World_Championship", "World Championship", stage, result)
+        self._insert_placings(year, "World_Championship", "World Championship", world_championship.final_standings)
+
+    def _clear(self, year, region, phase):
+        """Delete a phase's rows so a rerun into an existing database replaces them."""
+        match_ids = "SELECT id FROM matches WHERE year = ? AND region = ? AND phase = ?"
+        key = (year, region, phase)
+        for table in ("match_teams", "maps", "map_sequence", "player_stats"):
+            self.connection.execute(f"DELETE FROM {table} WHERE match_id IN ({match_ids})", key)
+        self.connection.execute("DELETE FROM matches WHERE year = ? AND region = ? AND phase = ?", key)
+        self.connection.execute("DELETE FROM standings WHERE year = ? AND region = ? AND phase = ?", key)
+
+    def _insert_placings(self, year, region, phase, teams):
+        rows = [(year, region, phase, position, team.name) for position, team in enumerate(teams, 1)]
+        self.connection.executemany(
+            "INSERT INTO standings (year, region, phase, position, team) VALUES (?, ?, ?, ?, ?)", rows
+        )
+
+    def _insert_match(self, year, region, phase, stage, result):
+        home, away = result['home_team'], result['away_team']
+        cursor = self.connection.execute(
+            "INSERT INTO matches (year, region, phase, stage, home_team, away_team, home_rating, away_rating, "
+            "home_score, away_score, winner) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (year, region, phase, stage, home.name, away.name, float(home.rating), float(away.rating),
+             result['home_score'], result['away_score'], result['winner'].name)
+        )
+        match_id = cursor.lastrowid
+        self.connection.executemany(
+            "INSERT INTO match_teams VALUES (?, ?, ?, ?, ?)",
+            [(match_id, year, region, home.name, away.name), (match_id, year, region, away.name, home.name)]
+        )
+        self.connection.executemany(
+            "INSERT INTO map_sequence VALUES (?, ?, ?, ?, ?)",
+            [(match_id, step, action, team.name if team else None, map_name)
+             for step, (action, team, map_name) in enumerate(result['map_sequence'])]
+        )
+
+        map_rows = []
+        stat_rows = []
+        for game_index, game in enumerate(result['games']):
+            home_score, away_score = game['score']
+            map_rows.append((match_id, game_index, game['map'], home_score, away_score))
+            if game['stats'] is None:
+                continue  # The markov engine doesn't produce player statistics
+            for team, team_key in ((home, 'home_team'), (away, 'away_team')):
+                lineup = result['lineups'][team_key]
+                for player_id, stats in game['stats'][team_key].items():
+                    stat_rows.append((match_id, game_index, team.name, player_name(lineup[player_id]),
+                                      stats['K'], stats['D'], stats['A']))
+        self.connection.executemany("INSERT INTO maps VALUES (?, ?, ?, ?, ?)", map_rows)
+        self.connection.executemany("INSERT INTO player_stats VALUES (?, ?, ?, ?, ?, ?, ?)", stat_rows)
+
+    def get_years(self):
+        return [row['year'] for row in self.connection.execute("SELECT DISTINCT year FROM matches ORDER BY year")]
+
+    def get_standings(self, year, region, phase="Regular Season"):
+        """Return standings rows ordered by position."""
+        return [dict(row) for row in self.connection.execute(
+            "SELECT position, team, wins, losses, map_wins, map_losses FROM standings "
+            "WHERE year = ? AND region = ? AND phase = ? ORDER BY position",
+            (year, region, phase)
+        )]
+
+    def get_team_matches(self, team, year=None, region=None, phase=None):
+        """Return a team's matches, oldest first, each with its maps and map sequence.
+
+        Without a year and region this covers every year.
+        """
+        query = "SELECT m.* FROM match_teams t JOIN matches m ON m.id = t.match_id WHERE t.team = ?"
+        params = [team]
+        if year is not None and region is not None:
+            query += " AND t.year = ? AND t.region = ?"
+            params += [year, region]
+        elif year is not None:
+            query += " AND t.year = ?"
+            params.append(year)
+        if phase is not None:
+            query += " AND m.phase = ?"
+            params.append(phase)
+        return self._with_details(self.connection.execute(query + " ORDER BY m.id", params))
+
+    def get_matches(self, year, region, phase=None):
+        """Return every match of a region's year, in the order they were played."""
+        query = "SELECT * FROM matches WHERE year = ? AND region = ?"
+        params = [year, region]
+        if phase is not None:
+            query += " AND phase = ?"
+            params.append(phase)
+        return self._with_details(self.connection.execute(query + " ORDER BY id", params))
+
+    def _with_details(self, rows):
+        matches = [dict(row) for row in rows]
+        for match in matches:
+            match['maps'] = [dict(row) for row in self.connection.execute(
+                "SELECT map, home_score, away_score FROM maps WHERE match_id = ? ORDER BY game_index", (match['id'],)
+            )]
+            match['map_sequence'] = [dict(row) for row in self.connection.execute(
+                "SELECT action, team, map FROM map_sequence WHERE match_id = ? ORDER BY step", (match['id'],)
+            )]
+        return matches
+
+    def get_player_stats(self, player, year=None):
+        """Return a player's K/D/A per map, oldest first."""
+        query = ("SELECT m.year, m.region, m.phase, p.team, mp.map, p.kills, p.deaths, p.assists "
+                 "FROM player_stats p JOIN matches m ON m.id = p.match_id "
+                 "JOIN maps mp ON mp.match_id = p.match_id AND mp.game_index = p.game_index "
+                 "WHERE p.player = ?")
+        params = [player]
+        if year is not None:
+            query += " AND m.year = ?"
+            params.append(year)
+        return [dict(row) for row in self.connection.execute(query + " ORDER BY p.match_id, p.game_index", params)]
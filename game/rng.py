@@ -0,0 +1,42 @@
+import random
+import numpy as np
+
+
+class RandomStream(random.Random):
+    """A random.Random seeded from a numpy SeedSequence.
+
+    Child streams from spawn() are independent of each other and of the order
+    they are used in. Each part of the simulation draws from its own child,
+    so it can be re-run on its own or in another process with the same results.
+    """
+
+    def __init__(self, seed=None):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        # The first half of the state seeds this stream, the second half the NumPy one
+        self._state = seed.generate_state(8)
+        self._numpy = None
+        super().__init__(int.from_bytes(self._state[:4].tobytes(), 'little'))
+
+    @property
+    def numpy(self):
+        """Return a numpy Generator for array draws, derived from the same seed."""
+        if self._numpy is None:
+            self._numpy = np.random.default_rng(self._state[4:])
+        return self._numpy
+
+    def spawn(self, n=None):
+        """Return an independent child stream, or a list of n of them."""
+        children = [RandomStream(child) for child in self.seed_sequence.spawn(1 if n is None else n)]
+        return children[0] if n is None else children
+
+    def __reduce__(self):
+        numpy_state = self._numpy.bit_generator.state if self._numpy is not None else None
+        return self.__class__, (self.seed_sequence,), (self.getstate(), numpy_state)
+
+    def __setstate__(self, state):
+        random_state, numpy_state = state
+        self.setstate(random_state)
+        if numpy_state is not None:
+            self.numpy.bit_generator.state = numpy_state
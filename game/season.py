@@ -1,37 +1,53 @@
-import random
 from .match import Match
 from .tournament import DoubleEliminationTournament
+from .rng import RandomStream
 
 class Season:
-    def __init__(self, teams, current_year):
+    def __init__(self, teams, current_year, rng=None):
         self.teams = teams
         self.current_year = current_year
+        self.rng = rng or RandomStream()
         self.matches = []
-        # Track wins, losses, map wins, map losses for each team
-        self.standings = {team: {'wins': 0, 'losses': 0, 'map_wins': 0, 'map_losses': 0} for team in teams}
+        # Track wins, losses, map wins, map losses and rounds for each team
+        self.standings = {
+            team: {'wins': 0, 'losses': 0, 'map_wins': 0, 'map_losses': 0, 'round_wins': 0, 'round_losses': 0}
+            for team in teams
+        }
         # Track head-to-head results
         self.head_to_head = {team: {other: 0 for other in teams if other != team} for team in teams}
+        # Sorted standings and their snapshot, rebuilt after a new result
+        self._sorted_standings = None
+        self._snapshot = None
 
-    def run_regular_season(self):
+    def run_regular_season(self, on_matchday=None):
+        """Play every matchup once.
+
+        on_matchday, if given, is called with the season after every
+        len(teams) // 2 matches and after the last one, e.g. to read
+        get_snapshot() for a live table.
+        """
         # Create a list of all possible matchups
         matchups = []
         for i, team1 in enumerate(self.teams):
             for team2 in self.teams[i+1:]:  # Only match with teams not yet played
                 # Randomly determine home/away
-                if random.random() < 0.5:
+                if self.rng.random() < 0.5:
                     matchups.append((team1, team2))
                 else:
                     matchups.append((team2, team1))
         
         # Shuffle the matchups for variety
-        random.shuffle(matchups)
+        self.rng.shuffle(matchups)
         
         # Play all matches
-        for home_team, away_team in matchups:
-            match = Match(home_team, away_team, match_type='R', current_year=self.current_year)
+        matches_per_matchday = max(1, len(self.teams) // 2)
+        for i, (home_team, away_team) in enumerate(matchups, 1):
+            match = Match(home_team, away_team, match_type='R', current_year=self.current_year, rng=self.rng.spawn())
             result = match.play()
             self.update_standings(result)
             self.matches.append(match)
+            if on_matchday and (i % matches_per_matchday == 0 or i == len(matchups)):
+                on_matchday(self)
 
     def update_standings(self, result):
         winner = result['winner']
@@ -48,6 +64,15 @@ class Season:
         self.standings[home_team]['map_losses'] += result['away_score']
         self.standings[away_team]['map_wins'] += result['away_score']
         self.standings[away_team]['map_losses'] += result['home_score']
+
+        # Update round record; map scores count every round, so engines that
+        # don't keep round details give the same differential
+        home_rounds = sum(game['score'][0] for game in result['games'])
+        away_rounds = sum(game['score'][1] for game in result['games'])
+        self.standings[home_team]['round_wins'] += home_rounds
+        self.standings[home_team]['round_losses'] += away_rounds
+        self.standings[away_team]['round_wins'] += away_rounds
+        self.standings[away_team]['round_losses'] += home_rounds
         
         # Update head-to-head
         if winner == home_team:
@@ -55,26 +80,17 @@ class Season:
         else:
             self.head_to_head[away_team][home_team] += 1
 
+        self._sorted_standings = None
+        self._snapshot = None
+
     def get_map_differential(self, team):
         stats = self.standings[team]
         return stats['map_wins'] - stats['map_losses']
 
     def get_round_differential(self, team):
-        """Calculate round differential for a team across all matches."""
-        total_rounds_won = 0
-        total_rounds_lost = 0
-        
-        for match in self.matches:
-            result = match.play()
-            if result['home_team'] == team or result['away_team'] == team:
-                for game in result['games']:
-                    for round_info in game['rounds']:
-                        if round_info['winner'] == team:
-                            total_rounds_won += 1
-                        else:
-                            total_rounds_lost += 1
-
-        return total_rounds_won - total_rounds_lost
+        """Return a team's round differential across all matches."""
+        stats = self.standings[team]
+        return stats['round_wins'] - stats['round_losses']
 
     def resolve_tiebreaker(self, tied_teams):
         if len(tied_teams) == 2:
@@ -85,12 +101,11 @@ class Season:
                 return [team2, team1]
         
         # Sort by map differential
-        map_diff_sorted = sorted(tied_teams, 
-                               key=lambda t: self.get_map_differential(t),
-                               reverse=True)
+        team_map_diffs = {team: self.get_map_differential(team) for team in tied_teams}
+        map_diff_sorted = sorted(tied_teams, key=team_map_diffs.get, reverse=True)
         
         # Check if map differential resolved the tie
-        map_diffs = [self.get_map_differential(team) for team in map_diff_sorted]
+        map_diffs = [team_map_diffs[team] for team in map_diff_sorted]
         if len(set(map_diffs)) == len(map_diffs):
             return map_diff_sorted
             
@@ -120,19 +135,32 @@ class Season:
 
     def resolve_tiebreaker_by_rounds(self, tied_teams):
         # Sort by round differential
-        round_diff_sorted = sorted(tied_teams,
-                                 key=lambda t: self.get_round_differential(t),
-                                 reverse=True)
+        round_diffs = {team: self.get_round_differential(team) for team in tied_teams}
+        round_diff_sorted = sorted(tied_teams, key=round_diffs.get, reverse=True)
         
         # If still tied, randomize the remaining teams
-        round_diffs = [self.get_round_differential(team) for team in round_diff_sorted]
-        if len(set(round_diffs)) != len(round_diffs):
-            import random
-            random.shuffle(round_diff_sorted)
+        if len(set(round_diffs.values())) != len(round_diffs):
+            self.rng.shuffle(round_diff_sorted)
             
         return round_diff_sorted
 
     def get_standings(self):
+        """Return teams in standings order, sorting only if a result came in since the last call."""
+        if self._sorted_standings is None:
+            self._sorted_standings = self._sort_standings()
+        return list(self._sorted_standings)
+
+    def get_snapshot(self):
+        """Return the current table as a tuple of (team name, wins, losses, map wins, map losses) rows."""
+        if self._snapshot is None:
+            self._snapshot = tuple(
+                (team.name, self.standings[team]['wins'], self.standings[team]['losses'],
+                 self.standings[team]['map_wins'], self.standings[team]['map_losses'])
+                for team in self.get_standings()
+            )
+        return self._snapshot
+
+    def _sort_standings(self):
         # First sort by win-loss record
         teams_by_record = sorted(self.teams,
                                key=lambda t: (self.standings[t]['wins'], -self.standings[t]['losses']),
@@ -180,12 +208,7 @@ class Season:
             result = match.play()
             text += f"({result['home_team'].rating:.1f}) {result['home_team'].name} {result['home_score']} - {result['away_score']} {result['away_team'].name} ({result['away_team'].rating:.1f})\n"
             
-            # Calculate map differentials
-            map_differentials = {
-                map_name: match._calculate_map_scores(result['home_team'], result['away_team'])[map_name] - 
-                         match._calculate_map_scores(result['away_team'], result['home_team'])[map_name]
-                for map_name in match.available_maps
-            }
+            map_differentials = result['map_differentials']
             
             # Add map sequence with differentials
             text += "Map Sequence:\n"
@@ -219,7 +242,8 @@ class Season:
         tournament = DoubleEliminationTournament(
             teams=top_teams, 
             match_type='P',
-            current_year=self.current_year  # Pass current_year to tournament
+            current_year=self.current_year,  # Pass current_year to tournament
+            rng=self.rng.spawn()
         )
         tournament.run()
         final_standings = tournament.get_standings()
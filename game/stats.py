@@ -0,0 +1,232 @@
+import atexit
+import json
+import os
+import queue
+import threading
+
+from . import metrics
+
+
+def get_stats_path(match):
+    """Return the file a match's statistics go to, relative to the working directory."""
+    if not match.current_year:
+        raise ValueError("current_year must be set for match statistics")
+
+    # For World Championship matches, use a special folder
+    if match.match_type in ['G', 'K']:
+        base_path = f"previous_results/{match.current_year}/World_Championship"
+    else:
+        base_path = f"previous_results/{match.current_year}/{match.home_team.region}"
+
+    # For World Championship matches, add stage information to filename
+    if match.match_type == 'G':
+        filename = f"{match.home_team.name}_{match.away_team.name}_Group.txt"
+    elif match.match_type == 'K':
+        filename = f"{match.home_team.name}_{match.away_team.name}_Knockout.txt"
+    else:
+        filename = f"{match.home_team.name}_{match.away_team.name}_{match.match_type}.txt"
+
+    return os.path.join(base_path, filename)
+
+
+def format_map_stats(home_name, away_name, map_name, map_stats):
+    """Return one map's statistics in the match statistics text format."""
+    lines = [f"\nMap: {map_name}", "-" * 13]
+    for team_name, team_key in ((home_name, 'home_team'), (away_name, 'away_team')):
+        lines.append(team_name)
+        lines.append("-" * 13)
+        lines.append("Player Name, K, D, A")
+        for player, stats in map_stats[team_key].items():
+            lines.append(f"{player}, {stats['K']}, {stats['D']}, {stats['A']}")
+        lines.append("")
+    lines[-1] = "\n" + "=" * 30
+    return "\n".join(lines) + "\n"
+
+
+class BackgroundWriter:
+    """Appends batches of file contents from a daemon thread."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._error = None
+
+    def submit(self, files):
+        """Queue a dict of path -> text to append."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+            self._thread.start()
+        self._queue.put(files)
+
+    def wait(self):
+        """Block until every queued batch is written."""
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            files = self._queue.get()
+            try:
+                created = set()
+                for path, text in files.items():
+                    directory = os.path.dirname(path)
+                    if directory not in created:
+                        os.makedirs(directory, exist_ok=True)
+                        created.add(directory)
+                    with open(path, 'a', encoding='utf-8') as f:
+                        f.write(text)
+            except Exception as e:
+                # Keep the thread alive for later batches; wait() raises the error
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+
+class StatsSink:
+    """Receives per-map player statistics from matches."""
+
+    name = None
+
+    def record(self, match, map_name, map_stats):
+        raise NotImplementedError
+
+    def flush(self):
+        """Hand everything recorded so far to the writer."""
+
+    def wait(self):
+        """Block until everything flushed is on disk."""
+
+    def close(self):
+        self.flush()
+        self.wait()
+
+
+class NullStatsSink(StatsSink):
+    """Discards statistics, for benchmarks and runs that don't need them."""
+
+    name = 'null'
+
+    def record(self, match, map_name, map_stats):
+        pass
+
+
+class BufferedStatsSink(StatsSink):
+    """Buffers statistics in memory and writes each file once per flush."""
+
+    def __init__(self):
+        self._pending = {}
+
+    def _entry(self, match, map_name, map_stats):
+        """Return (path, text) to append for one map."""
+        raise NotImplementedError
+
+    def record(self, match, map_name, map_stats):
+        path, text = self._entry(match, map_name, map_stats)
+        self._pending.setdefault(path, []).append(text)
+
+    def flush(self):
+        if self._pending:
+            files = {path: ''.join(texts) for path, texts in self._pending.items()}
+            self._pending = {}
+            if metrics.metrics_enabled():
+                # Counted when handed to the writer thread, which appends each file once
+                metrics.count('stats_files_written', len(files))
+                metrics.count('stats_bytes_written', sum(len(text.encode('utf-8')) for text in files.values()))
+            _get_writer().submit(files)
+
+    def wait(self):
+        _get_writer().wait()
+
+
+class TextStatsSink(BufferedStatsSink):
+    """Writes one text file per match, as previous_results/<year>/<region>/<home>_<away>_<type>.txt."""
+
+    name = 'text'
+
+    def _entry(self, match, map_name, map_stats):
+        text = format_map_stats(match.home_team.name, match.away_team.name, map_name, map_stats)
+        return get_stats_path(match), text
+
+
+class JsonStatsSink(BufferedStatsSink):
+    """Writes one JSON line per map to previous_results/<year>/<region>/match_stats.jsonl."""
+
+    name = 'json'
+
+    def _entry(self, match, map_name, map_stats):
+        record = {
+            'year': match.current_year,
+            'match_type': match.match_type,
+            'home_team': match.home_team.name,
+            'away_team': match.away_team.name,
+            'map': map_name,
+            'stats': {
+                team_key: {str(player): stats for player, stats in team_stats.items()}
+                for team_key, team_stats in map_stats.items()
+            }
+        }
+        path = os.path.join(os.path.dirname(get_stats_path(match)), "match_stats.jsonl")
+        return path, json.dumps(record) + "\n"
+
+
+STATS_SINKS = {
+    'text': TextStatsSink,
+    'json': JsonStatsSink,
+    'null': NullStatsSink
+}
+
+_stats_sink = None
+_writer = None
+
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        _writer = BackgroundWriter()
+    return _writer
+
+
+def _finish_writing():
+    # Daemon threads are stopped at exit, so finish any pending writes first
+    if _stats_sink is not None:
+        _stats_sink.flush()
+    if _writer is not None:
+        _writer.wait()
+
+
+def _reset_after_fork():
+    # The writer thread doesn't survive a fork and anything buffered belongs
+    # to the parent, so a forked worker starts with neither
+    global _stats_sink, _writer
+    _stats_sink = None
+    _writer = None
+
+
+atexit.register(_finish_writing)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_stats_sink():
+    """Return the sink matches send their statistics to."""
+    global _stats_sink
+    if _stats_sink is None:
+        _stats_sink = TextStatsSink()
+    return _stats_sink
+
+
+def set_stats_sink(sink):
+    """Replace the stats sink with a StatsSink or one of the names in STATS_SINKS.
+
+    The previous sink is flushed first so nothing it recorded is lost.
+    """
+    global _stats_sink
+    if isinstance(sink, str):
+        if sink not in STATS_SINKS:
+            raise ValueError(f"Unknown stats sink '{sink}', expected one of {', '.join(STATS_SINKS)}")
+        sink = STATS_SINKS[sink]()
+    if _stats_sink is not None:
+        _stats_sink.flush()
+    _stats_sink = sink
@@ -0,0 +1,40 @@
+import numpy as np
+from .player import Player
+
+# A group of players is stored as a bit mask over the team's roster order, so
+# a 5-player team has 31 non-empty groups
+TEAM_SIZE = 5
+MASKS = np.arange(1 << TEAM_SIZE)
+POPCOUNT = np.array([bin(mask).count('1') for mask in MASKS])
+MAP_INDEX = Player.MAP_IDS
+
+_MEMBERS = (MASKS[:, None] >> np.arange(TEAM_SIZE)) & 1
+
+
+def subset_strengths(skills):
+    """Return the summed skill of every group, indexed by mask.
+
+    skills has the player axis last, e.g. (players,) or (maps, players).
+    """
+    return np.asarray(skills, dtype=float) @ _MEMBERS.T
+
+
+def team_strengths(team):
+    """Return a (maps, groups) table of a team's effective skill on every map."""
+    return subset_strengths(team.registry.map_skills(team.player_ids))
+
+
+def encounter_probabilities(home_strengths, away_strengths):
+    """Return the clamped home win probability for every (home group, away group) pair.
+
+    Follows Match.simulate_group_encounter: the larger group gets a 0.1 bonus
+    per extra player and the probability is clamped between 0.1 and 0.9.
+    Leading axes (such as maps) are broadcast.
+    """
+    advantage = (POPCOUNT[:, None] - POPCOUNT[None, :]) * 0.1
+    home = home_strengths[..., :, None] * (1 + np.maximum(advantage, 0))
+    away = away_strengths[..., None, :] * (1 + np.maximum(-advantage, 0))
+    total = home + away
+    with np.errstate(invalid='ignore', divide='ignore'):
+        probs = np.where(total > 0, home / total, 0.5)  # Empty groups never meet
+    return np.clip(probs, 0.1, 0.9)
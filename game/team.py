@@ -1,38 +1,126 @@
 import numpy as np
-from .player import Player
-import random
+from .player import Player, LineupPlayer
+from .registry import Registry
+from . import strength
+from .rng import RandomStream
 
 class Team:
-    def __init__(self, name, region):
+    # Where the players' skills and map modifiers live; stand-in teams built
+    # for replays have their own (see from_lineup)
+    registry = Player.registry
+
+    def __init__(self, name, region, rng=None, players=None):
         self.name = name
         self.region = region
+        self.rng = rng or RandomStream()
         self.players = []
+        self.player_ids = np.zeros(0, dtype=np.int64)  # Registry IDs, in roster order
         self.previous_rating = None  # Store previous year's rating
+        self.version = 0  # Increases whenever the roster or a player's skill changes
+        self._subset_strengths = None
+        self._subset_strengths_version = None
+        self._map_skills = {}
+        self._map_skills_version = None
+        self._map_preferences = None
+        self._map_preferences_version = None
+        self._average_skill = None
+        self._average_skill_version = None
         
         # Initialize team with 5 players
-        for _ in range(5):
-            self.players.append(Player())
+        if players is None:
+            players = [Player(self.rng) for _ in range(5)]
+        for player in players:
+            self._add_player(player)
+
+    @classmethod
+    def from_lineup(cls, name, region, lineup):
+        """Return a stand-in team with players as they were when a match was played.
+
+        `lineup` holds Player.lineup_row() tuples. The stand-in's players live
+        in a registry of their own, so building one doesn't touch the real
+        players or the shared registry.
+        """
+        registry = Registry(len(Player.MAPS), capacity=max(1, len(lineup)))
+        team = cls(name, region, players=[LineupPlayer(registry, *row) for row in lineup])
+        team.registry = registry
+        return team
+
+    def _add_player(self, player):
+        player.team = self
+        self.players.append(player)
+        self._roster_changed()
+
+    def _remove_player(self, player):
+        self.players.remove(player)
+        player.team = None
+        self._roster_changed()
+
+    def _roster_changed(self):
+        self.player_ids = np.array([player.id for player in self.players], dtype=np.int64)
+        self.mark_changed()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Players copied within a process get new registry IDs; their data is
+        # unchanged, so the cached tables and version still hold
+        self.player_ids = np.array([player.id for player in self.players], dtype=np.int64)
+
+    def mark_changed(self):
+        """Record a roster or skill change so cached tables are rebuilt."""
+        self.version += 1
+
+    def get_subset_strengths(self):
+        """Return the (maps, groups) table of effective group skills, rebuilt after changes."""
+        if self._subset_strengths_version != self.version:
+            self._subset_strengths = strength.team_strengths(self)
+            self._subset_strengths_version = self.version
+        return self._subset_strengths
+
+    def get_map_skills(self, map_name):
+        """Return the players' skills including map modifiers as a tuple, rebuilt after changes."""
+        if self._map_skills_version != self.version:
+            self._map_skills = {}
+            self._map_skills_version = self.version
+        if map_name not in self._map_skills:
+            map_id = Player.MAP_IDS[map_name]
+            self._map_skills[map_name] = tuple(self.registry.map_skills(self.player_ids)[map_id].tolist())
+        return self._map_skills[map_name]
+
+    def get_map_preferences(self):
+        """Return, per map, players who like it minus players who dislike it, rebuilt after changes."""
+        if self._map_preferences_version != self.version:
+            # Per map: players with a positive modifier minus players with a negative one
+            modifiers = np.sign(self.registry.map_modifiers[self.player_ids]).sum(axis=0).tolist()
+            self._map_preferences = dict(zip(Player.MAPS, modifiers))
+            self._map_preferences_version = self.version
+        return self._map_preferences
 
     def manage_roster(self):
         changes = []
         for player in self.players:
             player.decrease_contract_length()
             if player.contract_years_left == 0:
-                if random.random() < 0.7:  # 70% chance to renew
-                    player.renew_contract()
+                if self.rng.random() < 0.7:  # 70% chance to renew
+                    player.renew_contract(self.rng)
                     changes.append(f"{player} renewed contract for {player.contract_length} years")
                 else:
                     old_player = player
-                    self.players.remove(player)
-                    new_player = Player()
-                    self.players.append(new_player)
+                    self._remove_player(old_player)
+                    new_player = Player(self.rng)
+                    self._add_player(new_player)
                     changes.append(f"{old_player} left, {new_player} joined for {new_player.contract_length} years")
         return changes
 
     def get_average_skill(self):
-        if not self.players:  # Safety check
-            return 0.0
-        return np.mean([player.skill for player in self.players])
+        """Return the mean player skill, recomputed only after a roster or skill change."""
+        if self._average_skill_version != self.version:
+            if not self.players:  # Safety check
+                self._average_skill = 0.0
+            else:
+                # np.mean rather than a running total, so the value is exactly what it always was
+                self._average_skill = np.mean(self.registry.skill[self.player_ids])
+            self._average_skill_version = self.version
+        return self._average_skill
 
     def store_previous_rating(self):
         """Store the team's current rating for next season's comparison"""
@@ -1,8 +1,15 @@
+from contextlib import nullcontext
 from .match import Match
+from .rng import RandomStream
+from .metrics import timer
 
 class DoubleEliminationTournament:
-    def __init__(self, teams, seeded=True, match_type='P', current_year=None):
+    # Names used for the stage timers in game/metrics.py
+    METRICS_NAMES = {'P': 'Playoffs', 'K': 'Worlds Knockout'}
+
+    def __init__(self, teams, seeded=True, match_type='P', current_year=None, rng=None):
         self.teams = teams
+        self.rng = rng or RandomStream()
         self.upper_bracket = self._create_seeded_bracket(teams) if seeded else teams.copy()
         self.lower_bracket = []
         self.upper_bracket_losers = []
@@ -35,19 +42,29 @@ class DoubleEliminationTournament:
         max_rounds = 20  # Safeguard against infinite loops
 
         while (len(self.upper_bracket) > 1 or len(self.lower_bracket) > 0) and round_count < max_rounds:
-            self.play_upper_bracket(silent)
-            self.play_lower_bracket(silent)
-            self.play_lower_bracket_with_upper_losers(silent)
+            with self._stage_timer("Upper Bracket", len(self.upper_bracket) > 1):
+                self.play_upper_bracket(silent)
+            with self._stage_timer("Lower Bracket", len(self.lower_bracket) > 1):
+                self.play_lower_bracket(silent)
+            with self._stage_timer("Lower Bracket with Upper Losers", self.lower_bracket and self.upper_bracket_losers):
+                self.play_lower_bracket_with_upper_losers(silent)
             round_count += 1
 
         if self.grand_finalist and len(self.lower_bracket) == 1:
-            self.play_grand_final(silent)
+            with self._stage_timer("Grand Final"):
+                self.play_grand_final(silent)
 
         # Ensure all teams are accounted for in the results
         for team in self.teams:
             if team not in self.results:
                 self.results.append(team)
 
+    def _stage_timer(self, stage, has_matches=True):
+        """Return the metrics timer for a bracket stage; passes with no matches aren't timed."""
+        if not has_matches:
+            return nullcontext()
+        return timer(f"stage/{self.METRICS_NAMES.get(self.match_type, self.match_type)}/{stage}")
+
     def play_upper_bracket(self, silent):
         if len(self.upper_bracket) > 1:
             next_round = []
@@ -59,7 +76,8 @@ class DoubleEliminationTournament:
                         self.upper_bracket[i+1], 
                         best_of=3, 
                         match_type=self.match_type,
-                        current_year=self.current_year
+                        current_year=self.current_year,
+                        rng=self.rng.spawn()
                     )
                     result = match.play()
                     self.match_results.append(("Upper Bracket", result))
@@ -83,7 +101,8 @@ class DoubleEliminationTournament:
                         self.lower_bracket[i+1], 
                         best_of=3, 
                         match_type=self.match_type,
-                        current_year=self.current_year
+                        current_year=self.current_year,
+                        rng=self.rng.spawn()
                     )
                     result = match.play()
                     self.match_results.append(("Lower Bracket", result))
@@ -106,7 +125,8 @@ class DoubleEliminationTournament:
                 best_of=best_of,
                 upper_loser=self.upper_bracket_losers[i],  # Pass the upper bracket loser
                 match_type=self.match_type,
-                current_year=self.current_year
+                current_year=self.current_year,
+                rng=self.rng.spawn()
             )
             result = match.play()
             self.match_results.append(("Lower Bracket with Upper Losers", result))
@@ -127,7 +147,8 @@ class DoubleEliminationTournament:
             self.lower_bracket[0], 
             best_of=5, 
             match_type=self.match_type,
-            current_year=self.current_year
+            current_year=self.current_year,
+            rng=self.rng.spawn()
         )
         result = match.play()
         self.match_results.append(("Grand Final", result))
@@ -212,13 +233,7 @@ class DoubleEliminationTournament:
             text += f"\nRound {round_num}:\n"
             text += "-" * 25 + "\n"
             for round_name, result in matches:
-                # Create a temporary match to calculate differentials
-                temp_match = Match(result['home_team'], result['away_team'])
-                map_differentials = {
-                    map_name: temp_match._calculate_map_scores(result['home_team'], result['away_team'])[map_name] - 
-                             temp_match._calculate_map_scores(result['away_team'], result['home_team'])[map_name]
-                    for map_name in temp_match.available_maps
-                }
+                map_differentials = result['map_differentials']
                 
                 text += f"{round_name}:\n"
                 text += f"({result['home_team'].rating:.1f}) {result['home_team'].name} {result['home_score']} - "
@@ -0,0 +1,165 @@
+import numpy as np
+
+from . import metrics
+from .player import Player
+
+MAX_GROUP_SIZE = 3
+ASSIST_CHANCE = 0.35
+INITIAL_ROUNDS = 26  # Enough for most maps; overtime maps draw more rounds
+EXTRA_ROUNDS = 8
+
+
+def effective_skills(team, map_name):
+    """Return an array of each player's skill including their map modifier."""
+    return team.registry.map_skills(team.player_ids)[Player.MAP_IDS[map_name]].astype(float)
+
+
+def _pick_groups(alive, sizes, rng):
+    """Pick a random group of the given size from the alive players of each round.
+
+    Returns the group mask and a mask of each group's first player, who plays
+    the role of the first player returned by random.sample.
+    """
+    keys = rng.random(alive.shape)
+    keys[~alive] = 2.0  # Dead players always sort last
+    ordered = np.sort(keys, axis=1)
+    rows = np.arange(len(keys))
+    group = keys <= ordered[rows, sizes - 1][:, None]
+    first = keys == ordered[:, :1]
+    return group, first
+
+
+def simulate_rounds(home_skills, away_skills, rng):
+    """Simulate one round for every row of the skill arrays at once.
+
+    home_skills and away_skills have shape (n, players) and hold effective
+    skills. Every row is an independent round that uses the same encounter
+    model as Match.simulate_round. rng is a numpy Generator, e.g. a
+    match's rng.numpy, so seeded runs stay reproducible.
+
+    Returns (home_won, kills, deaths, assists). home_won has shape (n,). The
+    stat arrays have shape (n, home players + away players), with home
+    players first.
+    """
+    n, home_count = home_skills.shape
+    skills = np.concatenate([home_skills, away_skills], axis=1)
+    alive = np.ones(skills.shape, dtype=bool)
+    is_home = np.zeros(skills.shape[1], dtype=bool)
+    is_home[:home_count] = True
+
+    kills = np.zeros(skills.shape, dtype=np.int64)
+    deaths = np.zeros(skills.shape, dtype=np.int64)
+    assists = np.zeros(skills.shape, dtype=np.int64)
+
+    # Counted as simulated, including rounds drawn past the end of a map
+    metrics.count('rounds', n)
+    active = np.arange(n)
+    while active.size:
+        metrics.count('encounters', active.size)
+        active_alive = alive[active]
+        home_alive = active_alive[:, :home_count]
+        away_alive = active_alive[:, home_count:]
+        max_size = np.minimum(MAX_GROUP_SIZE, np.minimum(home_alive.sum(1), away_alive.sum(1)))
+        home_size = rng.integers(1, max_size + 1)
+        away_size = rng.integers(1, max_size + 1)
+
+        home_group, home_first = _pick_groups(home_alive, home_size, rng)
+        away_group, away_first = _pick_groups(away_alive, away_size, rng)
+
+        # Numbers advantage bonus of 0.1 per extra player
+        advantage = (home_size - away_size) * 0.1
+        home_skill = (home_group * skills[active, :home_count]).sum(1) * (1 + np.maximum(advantage, 0))
+        away_skill = (away_group * skills[active, home_count:]).sum(1) * (1 + np.maximum(-advantage, 0))
+        home_win_prob = np.clip(home_skill / (home_skill + away_skill), 0.1, 0.9)
+        home_won = rng.random(active.size) < home_win_prob
+
+        group = np.concatenate([home_group, away_group], axis=1)
+        first = np.concatenate([home_first, away_first], axis=1)
+        winner_side = home_won[:, None] == is_home[None, :]
+        winners = group & winner_side
+        losers = group & ~winner_side
+        loser_count = np.where(home_won, away_size, home_size)
+
+        killer = winners & first
+        assisters = winners & ~first & (rng.random(group.shape) < ASSIST_CHANCE)
+        kills[active] += killer * loser_count[:, None]
+        assists[active] += assisters * loser_count[:, None]
+        deaths[active] += losers
+
+        alive[active] &= ~losers
+        still_alive = alive[active]
+        active = active[still_alive[:, :home_count].any(1) & still_alive[:, home_count:].any(1)]
+
+    return alive[:, :home_count].any(1), kills, deaths, assists
+
+
+def _map_end(home_won):
+    """Return the number of rounds each map lasts, or 0 if it has not finished yet.
+
+    A map ends when a team reaches 13 rounds with a lead of at least two,
+    which covers both regulation and the win-by-two overtime after 12-12.
+    """
+    home_score = np.cumsum(home_won, axis=1)
+    away_score = np.cumsum(~home_won, axis=1)
+    finished = (np.maximum(home_score, away_score) >= 13) & (np.abs(home_score - away_score) >= 2)
+    return np.where(finished.any(1), finished.argmax(1) + 1, 0)
+
+
+def simulate_maps(home_skills, away_skills, rng):
+    """Simulate many complete maps at once.
+
+    home_skills and away_skills have shape (maps, players) and hold the
+    effective skills for each map. Rounds within a map are independent, so
+    a block of rounds is drawn for every map in one batch and each map keeps
+    the rounds up to its final one. Maps still tied in overtime draw more.
+    rng is a numpy Generator, as for simulate_rounds.
+
+    Returns one dict per map with 'home_score', 'away_score', 'home_won'
+    (winner of each round) and 'kills'/'deaths'/'assists' per player.
+    """
+    home_skills = np.asarray(home_skills, dtype=float)
+    away_skills = np.asarray(away_skills, dtype=float)
+    num_maps, home_count = home_skills.shape
+    away_count = away_skills.shape[1]
+
+    rounds_won = [np.zeros(0, dtype=bool) for _ in range(num_maps)]
+    stats = [np.zeros((0, home_count + away_count), dtype=np.int64) for _ in range(3)]
+    stats = [[s] * num_maps for s in stats]
+    pending = np.arange(num_maps)
+    batch = INITIAL_ROUNDS
+
+    while pending.size:
+        home_won, kills, deaths, assists = simulate_rounds(
+            np.repeat(home_skills[pending], batch, axis=0),
+            np.repeat(away_skills[pending], batch, axis=0),
+            rng
+        )
+        shape = (pending.size, batch)
+        home_won = home_won.reshape(shape)
+        new_stats = [s.reshape(shape + (-1,)) for s in (kills, deaths, assists)]
+        for row, map_index in enumerate(pending):
+            rounds_won[map_index] = np.concatenate([rounds_won[map_index], home_won[row]])
+            for stat, new in zip(stats, new_stats):
+                stat[map_index] = np.concatenate([stat[map_index], new[row]])
+
+        ends = _map_end(np.array([rounds_won[i] for i in pending]))
+        for map_index, end in zip(pending, ends):
+            if end:
+                rounds_won[map_index] = rounds_won[map_index][:end]
+                for stat in stats:
+                    stat[map_index] = stat[map_index][:end]
+        pending = pending[ends == 0]
+        batch = EXTRA_ROUNDS
+
+    results = []
+    for map_index in range(num_maps):
+        home_won = rounds_won[map_index]
+        results.append({
+            'home_score': int(home_won.sum()),
+            'away_score': int((~home_won).sum()),
+            'home_won': home_won,
+            'kills': stats[0][map_index].sum(0),
+            'deaths': stats[1][map_index].sum(0),
+            'assists': stats[2][map_index].sum(0)
+        })
+    return results
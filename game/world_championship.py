@@ -1,26 +1,31 @@
 from .match import Match
 from .tournament import DoubleEliminationTournament
-import random
+from .rng import RandomStream
+from .metrics import timer
 
 class WorldChampionship:
-    def __init__(self, teams, current_year=None):
+    def __init__(self, teams, current_year=None, rng=None):
         self.teams = teams
+        self.rng = rng or RandomStream()
         self.regions = ["Americas", "Europe", "China", "Pacific"]
         self.match_results = []
         self.group_winners = []
         self.current_year = current_year
 
-    def run(self):
-        print("\n" + "="*50)
-        print("WORLD CHAMPIONSHIP".center(50))
-        print("="*50)
+    def run(self, silent=False):
+        if not silent:
+            print("\n" + "="*50)
+            print("WORLD CHAMPIONSHIP".center(50))
+            print("="*50)
         
         # Group Stage
         groups = self.create_balanced_groups()
-        self.run_group_stage(groups)
+        with timer("stage/Worlds/Group Stage"):
+            self.run_group_stage(groups, silent)
 
         if not self.group_winners:
-            print("Error: No group winners determined. Ending World Championship.")
+            if not silent:
+                print("Error: No group winners determined. Ending World Championship.")
             return
 
         # Knockout Stage - Set seeded=True for World Championship format
@@ -29,15 +34,18 @@ class WorldChampionship:
             knockout_teams, 
             seeded=False, 
             match_type='K', 
-            current_year=self.current_year
+            current_year=self.current_year,
+            rng=self.rng.spawn()
         )
-        tournament.run(silent=True)
+        with timer("stage/Worlds/Knockout Stage"):
+            tournament.run(silent=True)
         self.final_standings = tournament.get_standings()
         
         # Combine group stage and knockout stage results
         self.match_results.extend(tournament.match_results)
         
-        self.display_results(self.final_standings)
+        if not silent:
+            self.display_results(self.final_standings)
 
     def create_balanced_groups(self):
         # Separate teams by region
@@ -52,59 +60,67 @@ class WorldChampionship:
         groups = [[] for _ in range(4)]
         for region in self.regions:
             regional_teams = teams_by_region[region]
-            random.shuffle(regional_teams)
+            self.rng.shuffle(regional_teams)
             for i, team in enumerate(regional_teams):
                 groups[i].append(team)
 
         return groups
 
-    def run_group_stage(self, groups):
-        print("\nGROUP STAGE")
-        print("-"*50)
+    def run_group_stage(self, groups, silent=False):
+        if not silent:
+            print("\nGROUP STAGE")
+            print("-"*50)
         for i, group in enumerate(groups):
-            print(f"\nGroup {i+1}:")
-            print("-"*25)
+            if not silent:
+                print(f"\nGroup {i+1}:")
+                print("-"*25)
             
             # Initial upper bracket match
-            match1 = Match(group[0], group[1], match_type='G', current_year=self.current_year)
+            match1 = Match(group[0], group[1], match_type='G', current_year=self.current_year, rng=self.rng.spawn())
             result = match1.play()
             self.match_results.append((f"Group {i+1} Upper Bracket", result))
-            self.print_match_result(result)
+            if not silent:
+                self.print_match_result(result)
             upper_winner, upper_loser = result['winner'], result['loser']
 
             # Initial lower bracket match
-            match2 = Match(group[2], group[3], match_type='G', current_year=self.current_year)
+            match2 = Match(group[2], group[3], match_type='G', current_year=self.current_year, rng=self.rng.spawn())
             result = match2.play()
             self.match_results.append((f"Group {i+1} Lower Bracket", result))
-            self.print_match_result(result)
+            if not silent:
+                self.print_match_result(result)
             lower_winner, lower_loser = result['winner'], result['loser']
 
             # Winners' match (for 1st seed)
-            match3 = Match(upper_winner, lower_winner, match_type='G', current_year=self.current_year)
+            match3 = Match(upper_winner, lower_winner, match_type='G', current_year=self.current_year, rng=self.rng.spawn())
             result = match3.play()
             self.match_results.append((f"Group {i+1} Winners' Match", result))
-            self.print_match_result(result)
+            if not silent:
+                self.print_match_result(result)
             first_seed, winners_loser = result['winner'], result['loser']
 
             # Elimination match
-            match4 = Match(upper_loser, lower_loser, match_type='G', current_year=self.current_year)
+            match4 = Match(upper_loser, lower_loser, match_type='G', current_year=self.current_year, rng=self.rng.spawn())
             result = match4.play()
             self.match_results.append((f"Group {i+1} Elimination Match", result))
-            self.print_match_result(result)
+            if not silent:
+                self.print_match_result(result)
             elim_winner, elim_loser = result['winner'], result['loser']
 
             # Decider match (for 2nd seed)
-            match5 = Match(winners_loser, elim_winner, match_type='G', current_year=self.current_year)
+            match5 = Match(winners_loser, elim_winner, match_type='G', current_year=self.current_year, rng=self.rng.spawn())
             result = match5.play()
             self.match_results.append((f"Group {i+1} Decider Match", result))
-            self.print_match_result(result)
+            if not silent:
+                self.print_match_result(result)
             second_seed = result['winner']
 
             self.group_winners.extend([first_seed, second_seed])
-            print(f"\nGroup {i+1} Winners:")
-            print(f"1. {first_seed.name}")
-            print(f"2. {second_seed.name}")
-            print("-"*25)
+            if not silent:
+                print(f"\nGroup {i+1} Winners:")
+                print(f"1. {first_seed.name}")
+                print(f"2. {second_seed.name}")
+                print("-"*25)
 
     def create_knockout_matchups(self, group_winners):
         # Keep first place teams in order (they earned their seeds)
@@ -185,13 +201,7 @@ class WorldChampionship:
         away_team = result['away_team']
         print(f"({home_team.rating:.1f}) {home_team.name} {result['home_score']} - {result['away_score']} {away_team.name} ({away_team.rating:.1f})")
         
-        # Calculate map differentials
-        temp_match = Match(home_team, away_team)
-        map_differentials = {
-            map_name: temp_match._calculate_map_scores(home_team, away_team)[map_name] - 
-                     temp_match._calculate_map_scores(away_team, home_team)[map_name]
-            for map_name in temp_match.available_maps
-        }
+        map_differentials = result['map_differentials']
         
         # Add map sequence with differentials
         print("Map Sequence:")
@@ -232,13 +242,7 @@ class WorldChampionship:
                 away_team = result['away_team']
                 text += f"({home_team.rating:.1f}) {home_team.name} {result['home_score']} - {result['away_score']} {away_team.name} ({away_team.rating:.1f})\n"
                 
-                # Calculate map differentials
-                temp_match = Match(home_team, away_team)
-                map_differentials = {
-                    map_name: temp_match._calculate_map_scores(home_team, away_team)[map_name] - 
-                             temp_match._calculate_map_scores(away_team, home_team)[map_name]
-                    for map_name in temp_match.available_maps
-                }
+                map_differentials = result['map_differentials']
                 
                 # Add map sequence with differentials
                 text += "Map Sequence:\n"
@@ -284,13 +288,7 @@ class WorldChampionship:
                 away_team = result['away_team']
                 text += f"({home_team.rating:.1f}) {home_team.name} {result['home_score']} - {result['away_score']} {away_team.name} ({away_team.rating:.1f})\n"
                 
-                # Calculate map differentials
-                temp_match = Match(home_team, away_team)
-                map_differentials = {
-                    map_name: temp_match._calculate_map_scores(home_team, away_team)[map_name] - 
-                             temp_match._calculate_map_scores(away_team, home_team)[map_name]
-                    for map_name in temp_match.available_maps
-                }
+                map_differentials = result['map_differentials']
                 
                 # Add map sequence with differentials
                 text += "Map Sequence:\n"
@@ -2,6 +2,45 @@
 
 from pathlib import Path
 
+def open_results_store(results_dir="previous_results"):
+    """Return the results database written with GameManager(results_db=...), or None."""
+    db_path = Path(results_dir) / "results.db"
+    if not db_path.exists():
+        return None
+    from game.results_db import ResultsStore
+    return ResultsStore(str(db_path))
+
+def load_regular_season(store, year, region):
+    """Return the Regular Season section from the results database, shaped like parse_results_file's
+
+    Returns None if the database doesn't have that year and region, e.g. a
+    year simulated before results_db was turned on.
+    """
+    rows = store.get_standings(int(year), region)
+    if not rows:
+        return None
+    standings = [
+        f"{row['position']}. {row['team']:<20} {row['wins']}-{row['losses']} ({row['map_wins']}-{row['map_losses']})"
+        for row in rows
+    ]
+    matches = [
+        f"({m['home_rating']:.1f}) {m['home_team']} {m['home_score']} - {m['away_score']} {m['away_team']} ({m['away_rating']:.1f})"
+        for m in store.get_matches(int(year), region, "Regular Season")
+    ]
+    return {"standings": standings, "matches": matches}
+
+def to_match_data(match):
+    """Convert a results database match to the dict MatchDetailsViewer displays"""
+    return {
+        'team1': match['home_team'],
+        'team2': match['away_team'],
+        'score1': str(match['home_score']),
+        'score2': str(match['away_score']),
+        'rating1': f"{match['home_rating']:.1f}",
+        'rating2': f"{match['away_rating']:.1f}",
+        'maps': [{'name': m['map'], 'score': f"{m['home_score']}-{m['away_score']}"} for m in match['maps']]
+    }
+
 def get_available_years(results_dir="previous_results"):
     results_path = Path(results_dir)
     if not results_path.exists():
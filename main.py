@@ -1,24 +1,35 @@
+import argparse
+
 from game.manager import GameManager
+from game.profiling import add_profile_arguments, profiler_from_args
 from game.utils import clear_previous_results
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Esports Manager Game")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
     print("Welcome to the Esports Manager Game!")
     print("You'll be guiding your leagues through multiple seasons.")
     print("Use the menu options to navigate through different phases of the game.")
     print("\nLet's begin!")
-    
+
     # Clear previous results before starting new simulation
     clear_previous_results()
-    
+
     input("Press Enter to start the game...")
 
-    game_manager = GameManager()
-    
-    # Simulate the first off-season before starting the main game loop
-    game_manager.simulate_initial_off_season()
-    input("Press Enter to continue...")
+    game_manager = GameManager(profiler=profiler_from_args(args))
+
+    try:
+        # Simulate the first off-season before starting the main game loop
+        game_manager.simulate_initial_off_season()
+        input("Press Enter to continue...")
 
-    game_manager.start_game()
+        game_manager.start_game()
+    finally:
+        # Exiting from the menu ends the game loop, so write profiles here
+        game_manager.close()
 
 if __name__ == "__main__":
     main()
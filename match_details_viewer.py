@@ -3,6 +3,8 @@
 import tkinter as tk
 from tkinter import ttk
 
+from gui_utils import to_match_data
+
 class MatchDetailsViewer(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
@@ -65,6 +67,10 @@ class MatchDetailsViewer(ttk.Frame):
         
         # Store the current results file content
         self.current_content = ""
+        # Results database and the year/region shown, if the run wrote one
+        self.results_store = None
+        self.year = None
+        self.region = None
     
     def load_teams(self, standings):
         # Clear existing teams
@@ -123,6 +129,13 @@ class MatchDetailsViewer(ttk.Frame):
     
     def find_team_matches(self, team):
         print(f"Searching for matches with team: {team}")
+        if self.results_store is not None:
+            # Indexed lookup instead of rescanning the results file
+            rows = self.results_store.get_team_matches(team, int(self.year), self.region, "Regular Season")
+            # Fall back to the file for years the database doesn't have
+            if rows:
+                return [to_match_data(row) for row in rows]
+
         matches = []
         lines = self.current_content.split('\n')
         
@@ -5,7 +5,7 @@ from tkinter import ttk
 from pathlib import Path
 import os
 
-from gui_utils import get_available_years, parse_results_file, extract_playoff_standings
+from gui_utils import get_available_years, parse_results_file, extract_playoff_standings, open_results_store, load_regular_season
 from match_details_viewer import MatchDetailsViewer
 from playoff_viewer import PlayoffViewer
 
@@ -22,6 +22,8 @@ class ResultsViewer(tk.Tk):
         # Initialize tracking variables
         self.current_year = None
         self.current_region = None
+        # Indexed results database, if the simulation wrote one
+        self.results_store = open_results_store()
         
         # Initialize views
         self.setup_year_view()
@@ -145,6 +147,11 @@ class ResultsViewer(tk.Tk):
             
         # Extract sections
         sections = parse_results_file(content)
+        if self.results_store is not None:
+            # Years the database doesn't have keep the section parsed from the file
+            regular_season = load_regular_season(self.results_store, self.current_year, region)
+            if regular_season is not None:
+                sections["Regular Season"] = regular_season
         
         # Update section contents
         for section, text in sections.items():
@@ -202,6 +209,9 @@ class ResultsViewer(tk.Tk):
                 content = f.read()
                 print(f"Content length: {len(content)}")
                 self.match_viewer.current_content = content
+        self.match_viewer.results_store = self.results_store
+        self.match_viewer.year = self.current_year
+        self.match_viewer.region = self.current_region
         
         self.match_viewer.load_teams(standings)
 
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from game.batch import run_batch
+from game.utils import set_results_output
+
+
+@pytest.fixture(scope="session")
+def played_year(tmp_path_factory):
+    """A GameManager that has played one whole year, without writing result files."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("played_year"))
+    try:
+        manager, _ = run_batch(1, seed=3, write_results=False, report_every=0)
+    finally:
+        set_results_output(True)
+        os.chdir(cwd)
+    return manager
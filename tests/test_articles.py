@@ -0,0 +1,36 @@
+from game.articles import ArticleCache, StubBackend, generate_yearly_summary
+from game.utils import clear_previous_results
+
+
+def test_article_cache_survives_clear_previous_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = ArticleCache()
+    key = ArticleCache.key("prompt", "results", None, {})
+    cache.put(key, "article")
+
+    clear_previous_results()
+
+    assert ArticleCache().get(key) == "article"
+
+
+class FailingBackend(StubBackend):
+    """Stub that fails part way through the Worlds preview."""
+
+    def generate_stream(self, prompt):
+        for i, chunk in enumerate(super().generate_stream(prompt)):
+            if i == 1 and "previewing the 2024 World Championship" in prompt:
+                raise RuntimeError("connection reset")
+            yield chunk
+
+
+def test_streamed_errors_are_reported_between_articles(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "previous_results" / "2024").mkdir(parents=True)
+
+    summary = generate_yearly_summary(2024, backend=FailingBackend(), cache=None, stream=True)
+
+    marker = "[Error generating worlds_preview article]\n\n---\n\n"
+    assert marker in summary
+    assert "connection reset" not in summary
+    output = capsys.readouterr().out
+    assert marker + "Error generating worlds_preview article: connection reset\n" in output
@@ -0,0 +1,19 @@
+import json
+
+import pytest
+
+from game.digest import SECTION_STAGES, build_digest
+
+
+@pytest.mark.parametrize("section_name", sorted(SECTION_STAGES))
+@pytest.mark.parametrize("max_chars", [8000, 4000, 2000, 1000])
+def test_digest_fits_max_chars(played_year, section_name, max_chars):
+    digest = build_digest(played_year, section_name, max_chars)
+    assert len(json.dumps(digest)) <= max_chars
+
+
+def test_digest_keeps_every_league_at_its_floor(played_year):
+    digest = build_digest(played_year, "worlds_recap", 1)
+    assert len(json.dumps(digest)) < 1000
+    assert set(digest['leagues']) == {league.name for league in played_year.leagues}
+    assert digest['worlds']['final_standings'] == []
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from game.match import ENGINES, Match
+from game.player import Player
+from game.rng import RandomStream
+from game.team import Team
+from game.utils import set_results_output
+from game.vectorized import simulate_maps
+
+
+@pytest.fixture
+def no_results_output():
+    set_results_output(False)
+    yield
+    set_results_output(True)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_replay_after_roster_changes(engine, no_results_output):
+    home = Team("Home", "Europe", RandomStream(1))
+    away = Team("Away", "Europe", RandomStream(2))
+    full = Match(home, away, best_of=5, engine=engine, rng=RandomStream(9), compact=False).play()
+    match = Match(home, away, best_of=5, engine=engine, rng=RandomStream(9), compact=True)
+    result = match.play()
+
+    home.players[0].skill = 50
+    home._remove_player(home.players[1])
+    home._add_player(Player(RandomStream(5)))
+    replay = match.replay()
+
+    assert replay['winner'] is result['winner']
+    assert [game['score'] for game in replay['games']] == [game['score'] for game in result['games']]
+    assert [game['stats'] for game in replay['games']] == [game['stats'] for game in result['games']]
+    assert [round_info['winner'] for round_info in match.get_rounds(0)] == \
+        [round_info['winner'] for round_info in full['games'][0]['rounds']]
+
+
+def test_stats_are_keyed_by_player_id(no_results_output):
+    home = Team("Home", "Europe", RandomStream(3))
+    away = Team("Away", "Europe", RandomStream(4))
+    result = Match(home, away, rng=RandomStream(10)).play()
+
+    for team, team_key in ((home, 'home_team'), (away, 'away_team')):
+        ids = [player.id for player in team.players]
+        assert list(result['lineups'][team_key]) == ids
+        assert list(result['games'][0]['stats'][team_key]) == ids
+
+
+def test_vectorized_maps_are_reproducible():
+    skills = np.full((2, 5), 75.0)
+    first = simulate_maps(skills, skills, np.random.default_rng(1))
+    second = simulate_maps(skills, skills, np.random.default_rng(1))
+    assert [m['home_won'].tolist() for m in first] == [m['home_won'].tolist() for m in second]
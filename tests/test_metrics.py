@@ -0,0 +1,22 @@
+from game import metrics
+from game.forecast import Forecaster
+from game.manager import GameManager
+from game.utils import set_results_output
+
+
+def test_forecast_leaves_counters_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    set_results_output(False)
+    try:
+        manager = GameManager(seed=5, generate_summaries=False)
+        manager.simulate_initial_off_season()
+        metrics.enable_metrics()
+        metrics.count('matches', 3)
+        before = metrics.get_metrics().to_dict()
+
+        Forecaster(manager, simulations=5, seed=1).run()
+
+        assert metrics.get_metrics().to_dict() == before
+    finally:
+        metrics.enable_metrics(False)
+        set_results_output(True)
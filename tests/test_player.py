@@ -0,0 +1,42 @@
+import copy
+import pickle
+
+from game.player import Player
+from game.rng import RandomStream
+from game.team import Team
+
+
+def test_map_modifiers_follow_preference_changes():
+    player = Player(RandomStream(1))
+    player.good_maps = {'Bind'}
+    player.bad_maps = {'Lotus', 'Split'}
+
+    modifiers = player.map_modifiers
+    assert modifiers is player.map_modifiers
+    assert modifiers == tuple(Player.registry.map_modifiers[player.id].tolist())
+    assert player.get_map_skill_modifier('Bind') == Player.GOOD_MAP_MODIFIER
+    assert player.get_map_skill_modifier('Lotus') == Player.BAD_MAP_MODIFIER
+    assert player.get_map_skill_modifier('Haven') == 0
+
+
+def test_pickled_player_keeps_map_modifiers():
+    player = Player(RandomStream(2))
+    copy = pickle.loads(pickle.dumps(player))
+    assert copy.map_modifiers == player.map_modifiers
+    assert copy.good_maps == player.good_maps
+
+
+def test_copied_team_has_independent_players():
+    team = Team("Original", "Europe", RandomStream(3))
+    player = team.players[0]
+    skill, rating = player.skill, team.rating
+
+    copy_team = copy.deepcopy(team)
+    copy_player = copy_team.players[0]
+    assert copy_player.id != player.id
+    assert copy_team.player_ids.tolist() == [p.id for p in copy_team.players]
+
+    copy_player.skill = 50 if skill != 50 else 60
+    assert player.skill == skill
+    assert team.rating == rating
+    assert copy_team.rating != rating
@@ -0,0 +1,13 @@
+from game.results_db import ResultsStore
+from gui_utils import load_regular_season
+
+
+def test_viewer_falls_back_for_years_not_in_database(played_year, tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    store.record_phase(played_year, "Regular Season")
+    region = played_year.leagues[0].name
+
+    section = load_regular_season(store, played_year.current_year, region)
+    assert len(section["standings"]) == len(played_year.leagues[0].teams)
+    assert load_regular_season(store, played_year.current_year - 1, region) is None
+    store.close()
@@ -0,0 +1,15 @@
+import pytest
+
+from game.stats import BackgroundWriter
+
+
+def test_background_writer_survives_a_failed_batch(tmp_path):
+    writer = BackgroundWriter()
+    writer.submit({str(tmp_path / "bad.txt"): 123})  # Not text, so the write raises TypeError
+    with pytest.raises(TypeError):
+        writer.wait()
+
+    path = tmp_path / "stats" / "good.txt"
+    writer.submit({str(path): "line\n"})
+    writer.wait()
+    assert path.read_text() == "line\n"